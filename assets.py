@@ -0,0 +1,122 @@
+"""
+Prepared static media for the app.
+
+Team photos are centre-cropped and LANCZOS-resized once into .cache/assets,
+keyed by source path, size and mtime, so a changed photo gets a fresh
+thumbnail. The background video's base64 data URL is built once per file
+version. Results are also memoised in-process, so page renders only stat the
+source files and never decode an image.
+
+    python assets.py            # build the cache ahead of time
+"""
+import base64
+import hashlib
+import os
+import sys
+import threading
+from io import BytesIO
+
+import cache_util
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("ASSET_CACHE_DIR", os.path.join(ROOT, ".cache", "assets"))
+THUMB_SIZE = 140
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def _version(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _memoised(key, version, build):
+    # One entry per asset: a new file version replaces the old payload
+    # rather than sitting next to it for the life of the process.
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+    value = build()
+    with _memo_lock:
+        _memo[key] = (version, value)
+    return value
+
+
+# ===================== THUMBNAILS =====================
+
+def _render_thumbnail(path, size):
+    # PIL is only needed on a cache miss, so page renders never import it.
+    from PIL import Image
+
+    img = Image.open(path).convert("RGB")
+    w, h = img.size
+    m = min(w, h)
+    left = (w - m) // 2
+    top = (h - m) // 2
+    img = img.crop((left, top, left + m, top + m))
+    img = img.resize((size, size), Image.Resampling.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=92)
+    return buf.getvalue()
+
+
+def thumbnail(path, size=THUMB_SIZE):
+    """JPEG bytes of the square thumbnail, or None if the photo is missing."""
+    path = os.path.join(ROOT, path) if not os.path.isabs(path) else path
+    try:
+        version = _version(path)
+    except FileNotFoundError:
+        return None
+
+    def build():
+        tag = hashlib.blake2b(
+            f"{path}|{version[0]}|{version[1]}|{size}".encode(), digest_size=12,
+        ).hexdigest()
+        cached = os.path.join(CACHE_DIR, "thumbs", f"{tag}.jpg")
+        try:
+            with open(cached, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            data = _render_thumbnail(path, size)
+            cache_util.write_atomic(cached, lambda f: f.write(data))
+            return data
+
+    return _memoised(("thumb", path, size), version, build)
+
+
+# ===================== BACKGROUND VIDEO =====================
+
+def video_data_url(path):
+    """base64 data URL for an mp4, or None if the file is missing."""
+    path = os.path.join(ROOT, path) if not os.path.isabs(path) else path
+    try:
+        version = _version(path)
+    except FileNotFoundError:
+        return None
+
+    def build():
+        with open(path, "rb") as f:
+            b64 = base64.b64encode(f.read()).decode("utf-8")
+        return f"data:video/mp4;base64,{b64}"
+
+    return _memoised(("video", path), version, build)
+
+
+def prepare(photos=(), videos=()):
+    """Warm every asset; safe to call on each rerun since hits are memoised."""
+    for path in photos:
+        thumbnail(path)
+    for path in videos:
+        video_data_url(path)
+
+
+if __name__ == "__main__":
+    photo_dir = os.path.join(ROOT, "images")
+    photos = [
+        os.path.join(photo_dir, name) for name in sorted(os.listdir(photo_dir))
+        if name.lower().endswith((".jpg", ".jpeg", ".png"))
+    ]
+    prepare(photos, [os.path.join(ROOT, "assets", "background.mp4")])
+    print(f"prepared {len(photos)} thumbnails in {CACHE_DIR}", file=sys.stderr)
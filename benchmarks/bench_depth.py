@@ -0,0 +1,94 @@
+"""
+Cost and precision of the uint16 / float32 working formats against uint8.
+
+    python benchmarks/bench_depth.py [--size 1920x1080] [--repeat 5]
+
+"to" is converting the 8-bit upload into the working format and "display"
+is quantizing a result back to uint8; both are paid once per chain, not per
+step. The op columns run the same ops.py / enhance.py calls on each format.
+The last two columns run a chain that first squeezes the contrast (x0.4),
+blurs, then stretches it back (x2.5), and compare the 8-bit result with the
+same chain computed in float64: mean absolute error in 8-bit levels, and how
+many of the 256 output levels are actually used (banding).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import depth  # noqa: E402
+import enhance  # noqa: E402
+import ops  # noqa: E402
+
+
+def timed(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1000
+
+
+def chain(img):
+    img = ops.adjust_brightness_contrast(img, contrast=-60)
+    img = ops.gaussian_blur(img, 5)
+    return ops.adjust_brightness_contrast(img, contrast=150)
+
+
+def reference(img8):
+    img = img8.astype(np.float64) / 255.0 * 0.4
+    img = cv2.GaussianBlur(img, (5, 5), 0) * 2.5
+    return np.clip(img, 0.0, 1.0) * 255.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.split("x"))
+
+    # A smooth gradient with mild texture, where banding is easy to see.
+    x = np.linspace(0, 255, w, dtype=np.float32)[None, :, None]
+    y = np.linspace(0, 1, h, dtype=np.float32)[:, None, None]
+    rng = np.random.default_rng(0)
+    img8 = np.clip(x * (0.5 + 0.5 * y) + rng.normal(0, 2, (h, w, 3)), 0, 255).astype(np.uint8)
+    ref = reference(img8)
+    M = ops.rotation_matrix(15, w, h)
+    op_columns = [
+        ("blur", lambda i: ops.gaussian_blur(i, 15)),
+        ("sharpen", ops.sharpen),
+        ("bright", lambda i: ops.adjust_brightness_contrast(i, 10, 20)),
+        ("sobel", ops.edge_detect),
+        ("clahe", enhance.clahe),
+        ("rotate", lambda i: ops.apply_affine_transform(i, M)),
+    ]
+
+    print(f"image {w}x{h} ({w * h / 1e6:.1f} MP), median of {args.repeat}, times in ms")
+    header = f"{'format':>8} {'to':>6} {'display':>8}"
+    header += "".join(f" {name:>8}" for name, _ in op_columns)
+    header += f" {'chain':>7} {'error':>6} {'levels':>7}"
+    print(header)
+    for fmt in depth.FORMATS:
+        work = depth.to_format(img8, fmt)
+        out = chain(work)
+        shown = depth.quantize(out)
+        row = f"{fmt:>8}"
+        row += f" {timed(lambda: depth.to_format(img8, fmt), args.repeat):>6.1f}"
+        row += f" {timed(lambda: depth.quantize(out), args.repeat):>8.1f}"
+        for _, fn in op_columns:
+            row += f" {timed(lambda: fn(work), args.repeat):>8.1f}"
+        row += f" {timed(lambda: chain(work), args.repeat):>7.1f}"
+        row += f" {np.abs(shown - ref).mean():>6.2f}"
+        row += f" {len(np.unique(shown)):>7}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Per-method latency of the contrast tools on a large frame.
+
+    python benchmarks/bench_enhance.py [--size 5472x3648] [--repeat 3]
+
+The OpenCV built-ins are listed for reference next to the enhance.py versions.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import enhance  # noqa: E402
+from ops import adjust_brightness_contrast  # noqa: E402
+
+
+def cv2_clahe(img):
+    ycrcb = cv2.cvtColor(img, cv2.COLOR_RGB2YCrCb)
+    ycrcb[:, :, 0] = cv2.createCLAHE(2.0, (8, 8)).apply(ycrcb[:, :, 0])
+    return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
+
+
+def cv2_equalize(img):
+    ycrcb = cv2.cvtColor(img, cv2.COLOR_RGB2YCrCb)
+    ycrcb[:, :, 0] = cv2.equalizeHist(ycrcb[:, :, 0])
+    return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
+
+
+METHODS = [
+    ("linear alpha/beta", lambda img: adjust_brightness_contrast(img, 20, 30)),
+    ("equalize", enhance.equalize),
+    ("clahe 8x8", lambda img: enhance.clahe(img, 2.0, (8, 8))),
+    ("auto_levels 1-99%", lambda img: enhance.auto_levels(img, 1.0, 99.0)),
+    ("cv2 equalizeHist", cv2_equalize),
+    ("cv2 CLAHE 8x8", cv2_clahe),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="5472x3648")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.split("x"))
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(20, 160, (h // 16, w // 16, 3), dtype=np.uint8)
+    img = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+
+    print(f"image {w}x{h} ({w * h / 1e6:.1f} MP), {os.cpu_count()} CPUs, median of {args.repeat}")
+    for name, fn in METHODS:
+        fn(img)
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn(img)
+            times.append(time.perf_counter() - t0)
+        print(f"{name:>20}: {np.median(times) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Bytes allocated per request: legacy upload -> blur -> download path versus
+the image_io path.
+
+    python benchmarks/bench_image_io.py [--size 3000x2000] [--repeat 5]
+
+tracemalloc sees every numpy/OpenCV array allocation; PIL's internal image
+buffers are plain malloc and are not included.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import cv2
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import image_io  # noqa: E402
+
+
+def legacy_request(upload):
+    img = np.array(Image.open(BytesIO(upload)).convert("RGB"))
+    img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    out_bgr = cv2.GaussianBlur(img_bgr, (5, 5), 0)
+    out = cv2.cvtColor(out_bgr, cv2.COLOR_BGR2RGB)
+    encoded = []
+    for fmt in ("PNG", "JPEG"):
+        arr = np.array(out)
+        pil_img = Image.fromarray(arr.astype("uint8"))
+        buf = BytesIO()
+        pil_img.save(buf, format=fmt)
+        encoded.append(buf.getvalue())
+    return encoded
+
+
+def image_io_request(upload):
+    img = image_io.load_image(BytesIO(upload))
+    out = cv2.GaussianBlur(img, (5, 5), 0)
+    return [image_io.image_to_bytes(out, fmt) for fmt in ("PNG", "JPEG")]
+
+
+def measure(fn, upload, repeat):
+    fn(upload)  # warm-up: codec tables
+    peaks, times = [], []
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn(upload)
+        times.append(time.perf_counter() - t0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return np.median(peaks), np.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="3000x2000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.split("x"))
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (h // 8, w // 8, 3), dtype=np.uint8)
+    frame = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+    buf = BytesIO()
+    Image.fromarray(frame).save(buf, format="JPEG", quality=92)
+    upload = buf.getvalue()
+
+    print(f"image {w}x{h}, upload {len(upload) / 1e6:.1f} MB JPEG")
+    for name, fn in (("legacy", legacy_request), ("image_io", image_io_request)):
+        peak, elapsed = measure(fn, upload, args.repeat)
+        print(f"{name:>9}: peak traced {peak / 1e6:7.1f} MB   {elapsed * 1000:7.1f} ms")
+
+    with image_io.track() as stats:
+        image_io_request(upload)
+    print("image_io allocations per request:", stats)
+
+
+if __name__ == "__main__":
+    main()
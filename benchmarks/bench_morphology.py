@@ -0,0 +1,66 @@
+"""
+Latency of the morphology and median filters as the window grows.
+
+    python benchmarks/bench_morphology.py [--size 1920x1080] [--radii 1,4,16,64,128,256] [--repeat 3]
+
+"image" rows are morphology.py on the RGB frame (cv2 below VHGW_MIN_RADIUS,
+van Herk/Gil-Werman above), "cv2" rows force cv2.erode for comparison and
+"mask" rows are masks.py on the packed background mask.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import masks  # noqa: E402
+import morphology  # noqa: E402
+from ops import background_mask  # noqa: E402
+
+
+def timed(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--radii", default="1,4,16,64,128,256")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.split("x"))
+    radii = [int(r) for r in args.radii.split(",")]
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (h // 16, w // 16, 3), dtype=np.uint8)
+    img = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+    mask = background_mask(img, (0, 0, 120), (180, 255, 255))
+
+    print(f"image {w}x{h} ({w * h / 1e6:.1f} MP), {os.cpu_count()} CPUs, median of {args.repeat}")
+    print(f"{'radius':>8} {'image erode':>12} {'cv2 erode':>10} {'image median':>13} "
+          f"{'mask erode':>11} {'mask median':>12}")
+    for r in radii:
+        k = 2 * r + 1
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (k, k))
+        row = [
+            timed(lambda: morphology.erode(img, r), args.repeat),
+            timed(lambda: cv2.erode(img, kernel), args.repeat),
+            timed(lambda: morphology.median(img, r), args.repeat),
+            timed(lambda: masks.erode(mask, r), args.repeat),
+            timed(lambda: masks.median(mask, r), args.repeat),
+        ]
+        print(f"{r:>8} {row[0]:>9.1f} ms {row[1]:>7.1f} ms {row[2]:>10.1f} ms "
+              f"{row[3]:>8.1f} ms {row[4]:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of filtering a region of interest against filtering the whole frame.
+
+    python benchmarks/bench_roi.py [--size 6000x4000] [--fractions 1,0.25,0.05,0.01] [--repeat 3]
+
+For each region size (a centred rectangle covering the given fraction of the
+frame) the blur, morphology, low-pass and rotation tools are run through
+roi.apply / roi.warp, and the whole-frame call is shown on the "full" row.
+Latency is the median of --repeat runs; "peak" is the largest amount of
+memory allocated through numpy (which includes OpenCV's outputs) while the
+call runs, over and above the frame itself.
+
+It then checks the keyed spectrum cache the app uses for regions: two
+low-pass Applies with different cutoffs on one region (so different halos,
+so different patches) must match the same filters computed without a key.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import frequency  # noqa: E402
+import morphology  # noqa: E402
+import roi  # noqa: E402
+from ops import gaussian_blur, rotation_matrix  # noqa: E402
+
+
+def measure(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.median(times) * 1000, peak / 2 ** 20
+
+
+def check_region_spectra(img, region):
+    for cutoff in (0.15, 0.05):
+        halo = frequency.pass_halo("lowpass", cutoff=cutoff)
+        key = "bench:" + region.patch_key(halo)
+        keyed = roi.apply(img, lambda i: frequency.pass_filter(i, "lowpass", cutoff=cutoff, key=key), region, halo)
+        fresh = roi.apply(img, lambda i: frequency.pass_filter(i, "lowpass", cutoff=cutoff), region, halo)
+        if not np.array_equal(keyed, fresh):
+            raise SystemExit(f"region spectrum reused across halos (cutoff {cutoff})")
+    print("region spectra: keyed results match unkeyed ones for cutoffs 0.15 and 0.05")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="6000x4000")
+    parser.add_argument("--fractions", default="1,0.25,0.05,0.01")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.split("x"))
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (h // 16, w // 16, 3), dtype=np.uint8)
+    img = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+    M = rotation_matrix(15, w, h)
+    tools = [
+        ("blur k=31", 16, lambda i: gaussian_blur(i, 31)),
+        ("opening r=8", morphology.halo("opening", 8), lambda i: morphology.opening(i, 8)),
+        ("low-pass", frequency.pass_halo("lowpass", cutoff=0.1),
+         lambda i: frequency.pass_filter(i, "lowpass", cutoff=0.1)),
+    ]
+
+    print(f"image {w}x{h} ({w * h / 1e6:.1f} MP), median of {args.repeat}")
+    header = f"{'region':>8}" + "".join(f" {name:>22}" for name, _, _ in tools) + f" {'rotate':>22}"
+    print(header)
+    rows = [("full", None)]
+    for fraction in (float(f) for f in args.fractions.split(",")):
+        side = np.sqrt(fraction)
+        rows.append((f"{100 * fraction:g}%", roi.Region.from_fractions(
+            (0.5 - side / 2, 0.5 + side / 2), (0.5 - side / 2, 0.5 + side / 2), img.shape,
+        )))
+    for label, region in rows:
+        row = f"{label:>8}"
+        for _, halo, fn in tools:
+            ms, mb = measure(lambda: roi.apply(img, fn, region, halo), args.repeat)
+            row += f" {ms:>8.1f} ms {mb:>6.0f} MB"
+        ms, mb = measure(lambda: roi.warp(img, M, region), args.repeat)
+        row += f" {ms:>8.1f} ms {mb:>6.0f} MB"
+        print(row)
+    print("region rows include the frame-sized copy the result is pasted into "
+          f"({img.nbytes / 2 ** 20:.0f} MB)")
+    check_region_spectra(img, rows[-1][1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cold-start and rerun cost of the Streamlit app, per page.
+
+    python benchmarks/bench_startup.py [--reruns 20] [--repeat 3] [--compare REV]
+
+Each repeat starts a fresh interpreter and drives group.py with Streamlit's
+AppTest: the first run lands on the Explanation page (cold start, imports
+included), then the Team and Processing pages are visited in turn. For each
+page the first visit and the median of --reruns warm reruns are reported,
+with compiled bytecode reused across reruns as the Streamlit server does.
+--compare REV runs the same measurement on the app as of git revision REV
+(extracted with git archive) for a before/after table.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = [("explanation", 0), ("team", 2), ("processing", 1)]
+HEAVY_MODULES = ("cv2", "matplotlib", "PIL.Image")
+
+
+def child(root, reruns):
+    os.chdir(root)
+    sys.path.insert(0, root)
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    # AppTest compiles the script afresh on every run; the server keeps one
+    # ScriptCache per app, so share one here to measure real reruns.
+    shared_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared_cache
+    result = {}
+
+    at = AppTest.from_file(os.path.join(root, "group.py"), default_timeout=120)
+    for i, (name, index) in enumerate(PAGES):
+        t0 = time.perf_counter()
+        if i == 0:
+            at.run()
+        else:
+            radio = at.sidebar.radio[0]
+            radio.set_value(radio.options[index]).run()
+        first = (time.perf_counter() - t0) * 1000
+        if at.exception:
+            raise SystemExit(f"{name}: {at.exception}")
+        times = []
+        for _ in range(reruns):
+            t0 = time.perf_counter()
+            at.run()
+            times.append((time.perf_counter() - t0) * 1000)
+        result[name] = {
+            "first_ms": first,
+            "rerun_ms": float(np.median(times)),
+            "modules": [m for m in HEAVY_MODULES if m in sys.modules],
+        }
+    print(json.dumps(result))
+
+
+def measure(root, reruns, repeat):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", root, "--reruns", str(reruns)],
+            check=True, capture_output=True, text=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    summary = {}
+    for name, _ in PAGES:
+        summary[name] = {
+            key: float(np.median([r[name][key] for r in runs])) for key in ("first_ms", "rerun_ms")
+        }
+        summary[name]["modules"] = runs[0][name]["modules"]
+    return summary
+
+
+def extract(rev):
+    directory = tempfile.mkdtemp(prefix="bench_startup_")
+    archive = subprocess.run(["git", "-C", ROOT, "archive", rev], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+    for name in ("assets", "images"):
+        # Media may be untracked; share the working tree's copies.
+        if not os.path.exists(os.path.join(directory, name)) and os.path.isdir(os.path.join(ROOT, name)):
+            os.symlink(os.path.join(ROOT, name), os.path.join(directory, name))
+    return directory
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare", metavar="REV")
+    parser.add_argument("--child", metavar="ROOT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.reruns)
+        return
+
+    columns = [("current", measure(ROOT, args.reruns, args.repeat))]
+    if args.compare:
+        columns.insert(0, (args.compare, measure(extract(args.compare), args.reruns, args.repeat)))
+
+    print(f"median of {args.repeat} fresh processes, {args.reruns} reruns each")
+    header = f"{'page':>12} {'':>10}" + "".join(f" {label:>14}" for label, _ in columns)
+    print(header)
+    for name, _ in PAGES:
+        for key, label in (("first_ms", "first visit"), ("rerun_ms", "rerun")):
+            row = f"{name:>12} {label:>10}"
+            for _, summary in columns:
+                row += f" {summary[name][key]:>11.1f} ms"
+            print(row)
+    print("heavy modules loaded after each page:")
+    for label, summary in columns:
+        for name, _ in PAGES:
+            print(f"  {label:>10} {name:>12}: {', '.join(summary[name]['modules']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
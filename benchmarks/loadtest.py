@@ -0,0 +1,142 @@
+"""
+Load test for service.py over keep-alive connections.
+
+    python service.py --port 8502 &
+    python benchmarks/loadtest.py --op blur --query k=7 --concurrency 16 --duration 10
+
+--spawn starts a service instance on a free localhost port for the run.
+Each connection sends requests back to back; the report gives p50/p99
+latency and throughput. --distinct N cycles through N different images
+(N=1 means every request carries the same image, which the service coalesces).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import cv2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_images(size, distinct):
+    w, h = size
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(distinct):
+        base = rng.integers(0, 256, (h // 8, w // 8, 3), dtype=np.uint8)
+        frame = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+        images.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return images
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, path, images, deadline, remaining, latencies, errors, offset):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline and remaining[0] != 0:
+            remaining[0] -= 1
+            body = images[i % len(images)]
+            i += 1
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/octet-stream\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            t0 = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(host, port, timeout=15.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"service did not come up on {host}:{port}")
+
+
+async def run(args, images):
+    path = f"/v1/{args.op}" + (f"?{args.query}" if args.query else "")
+    latencies, errors = [], {}
+    remaining = [args.requests if args.requests else -1]
+    deadline = time.perf_counter() + (args.duration if not args.requests else 1e9)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, path, images, deadline, remaining, latencies, errors, n)
+        for n in range(args.concurrency)
+    ))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--spawn", action="store_true", help="start service.py for the run")
+    parser.add_argument("--op", default="blur")
+    parser.add_argument("--query", default="k=7")
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--distinct", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests instead")
+    args = parser.parse_args()
+
+    proc = None
+    if args.spawn:
+        args.port = free_port()
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "service.py"), "--host", args.host, "--port", str(args.port)],
+            stdout=subprocess.DEVNULL,
+        )
+        wait_for(args.host, args.port)
+    try:
+        images = make_images(tuple(int(v) for v in args.size.split("x")), args.distinct)
+        latencies, errors, elapsed = asyncio.run(run(args, images))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    ms = np.asarray(latencies) * 1000.0
+    print(f"{args.op}?{args.query}  {args.size}  concurrency={args.concurrency}  distinct={args.distinct}")
+    print(f"requests: {len(ms)}  errors: {sum(errors.values())} {errors or ''}")
+    if len(ms):
+        print(f"latency  p50 {np.percentile(ms, 50):7.1f} ms   p99 {np.percentile(ms, 99):7.1f} ms"
+              f"   mean {ms.mean():7.1f} ms")
+    print(f"throughput {len(ms) / elapsed:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# ===================== SHARED CACHE HELPERS =====================
+#
+# Standard library only, so the light modules (assets.py) can use it without
+# pulling numpy into page start-up.
+#   * ByteLRU is the per-process LRU behind the remap tables (warp.py) and
+#     the image spectra (frequency.py): bounded by the bytes of its values
+#     rather than by a count, since a single value can be tens of MB.
+#   * write_atomic writes a file through a temporary file in the same
+#     directory, so concurrent readers see the old file or the new one and
+#     never a partial write, and a failed write leaves nothing behind.
+
+
+class ByteLRU:
+    def __init__(self, max_bytes, nbytes=lambda value: value.nbytes):
+        self.max_bytes = max_bytes
+        self._nbytes = nbytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get_or_build(self, key, build):
+        """Cached value for key, or build() stored if it fits the budget."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+            self._stats["misses"] += 1
+
+        # Built outside the lock so other keys are served meanwhile.
+        value = build()
+        size = self._nbytes(value)
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = value
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= self._nbytes(old)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats["hits"] = 0
+            self._stats["misses"] = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+            }
+
+
+def write_atomic(path, write):
+    """Create or replace path with what write(f) writes to a binary file f."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
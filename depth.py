@@ -0,0 +1,64 @@
+import numpy as np
+import cv2
+
+# ===================== WORKING FORMATS =====================
+#
+# The image operations accept three sample formats, all full-range:
+#   * uint8    0..255    (the default, and what JPEG and the browser use)
+#   * uint16   0..65535  (16-bit PNG/TIFF sources, and 8-bit ones widened
+#                         exactly by x257 so that 255 maps to 65535)
+#   * float32  0.0..1.0  (may leave the range in between steps; nothing is
+#                         clipped until the image is quantized)
+# A chain runs entirely in one format and is only quantized to uint8 for
+# display or 8-bit export, so intermediate results keep their precision.
+
+FORMATS = ("uint8", "uint16", "float32")
+
+
+def full_scale(dtype):
+    """Value of a full-intensity sample in dtype."""
+    dtype = np.dtype(dtype)
+    if dtype == np.uint8:
+        return 255
+    if dtype == np.uint16:
+        return 65535
+    return 1.0
+
+
+def hist_range(dtype):
+    """[low, high) covering every in-range value of dtype, for cv2.calcHist."""
+    if np.issubdtype(dtype, np.integer):
+        return [0, full_scale(dtype) + 1]
+    # calcHist's upper bound is exclusive; keep 1.0 itself in the last bin.
+    return [0.0, float(np.nextafter(np.float32(1.0), np.float32(2.0)))]
+
+
+def format_of(img):
+    return np.dtype(img.dtype).name if img.dtype in (np.uint8, np.uint16) else "float32"
+
+
+def to_format(img, fmt):
+    """img (uint8, uint16 or float) rescaled to working format fmt."""
+    src = format_of(img)
+    if src == fmt:
+        return img if img.dtype != np.float64 else img.astype(np.float32)
+    if fmt == "uint8":
+        if src == "uint16":
+            # convertScaleAbs rounds and saturates in one pass.
+            return cv2.convertScaleAbs(img, alpha=1.0 / 257)
+        return cv2.convertScaleAbs(np.maximum(img, 0, dtype=np.float32), alpha=255.0)
+    if fmt == "uint16":
+        if src == "uint8":
+            return np.multiply(img, 257, dtype=np.uint16)
+        out = np.clip(img, 0.0, 1.0, dtype=np.float32)
+        out *= 65535.0
+        out += 0.5
+        return out.astype(np.uint16)
+    if fmt == "float32":
+        return np.multiply(img, np.float32(1.0 / full_scale(img.dtype)), dtype=np.float32)
+    raise ValueError(f"unknown working format {fmt!r}")
+
+
+def quantize(img):
+    """8-bit copy for display or 8-bit export; uint8 input is returned as is."""
+    return to_format(img, "uint8")
@@ -0,0 +1,213 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import cv2
+
+import depth
+
+# ===================== CONTRAST ENHANCEMENT =====================
+#
+# Histogram equalization, CLAHE and percentile auto-levels all reduce to:
+# one pass to build a 256-bin histogram, a cumulative sum, and a 256-entry
+# lookup table applied with cv2.LUT. Colour images are enhanced on the luma
+# (Y of YCrCb) channel so hues are preserved, except auto-levels, which
+# stretches R, G and B with one shared LUT.
+#
+# uint16 and float32 images use the same 256-bin histograms over their full
+# range, but the LUT is read as a curve sampled at 256 points and
+# interpolated to all 65536 16-bit levels (apply_lut), so the output keeps
+# the input's precision instead of being posterized to 256 levels; the
+# lookup itself is then a single gather.
+#
+# CLAHE computes one LUT per tile and blends the four nearest tile LUTs per
+# pixel. Both the per-tile histograms and the per-block blends are
+# independent, so they run on a thread pool; OpenCV releases the GIL.
+
+_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="enhance")
+
+
+# ===================== HISTOGRAM CORE =====================
+
+def histogram(channel):
+    """256-bin histogram over the array's full range in a single pass."""
+    return cv2.calcHist([channel], [0], None, [256], depth.hist_range(channel.dtype)).ravel()
+
+
+def dense_lut(lut):
+    """lut (256 values on the 8-bit scale) interpolated at every 16-bit level, as float32."""
+    levels = np.arange(65536, dtype=np.float32) * np.float32(255.0 / 65535.0)
+    return np.interp(levels, np.arange(256, dtype=np.float32), lut).astype(np.float32)
+
+
+def _levels16(channel):
+    return channel if channel.dtype == np.uint16 else depth.to_format(channel, "uint16")
+
+
+def apply_lut(channel, lut):
+    """cv2.LUT for uint8; an interpolated curve in the channel's own format otherwise."""
+    if channel.dtype == np.uint8:
+        return cv2.LUT(channel, lut)
+    out = dense_lut(lut)[_levels16(channel)]
+    out *= np.float32(depth.full_scale(channel.dtype) / 255.0)
+    if channel.dtype == np.uint16:
+        out += 0.5
+    return out.astype(channel.dtype)
+
+
+def cdf(hist):
+    return np.cumsum(hist, dtype=np.float64)
+
+
+def equalize_lut(hist):
+    """LUT mapping each level to its normalised CDF, as in cv2.equalizeHist."""
+    c = cdf(hist)
+    total = c[-1]
+    first = c[np.flatnonzero(hist)[0]] if total else 0.0
+    if total == first:
+        return np.arange(256, dtype=np.uint8)
+    lut = np.round((c - first) * 255.0 / (total - first))
+    return np.clip(lut, 0, 255).astype(np.uint8)
+
+
+def percentile_levels(hist, low_pct, high_pct):
+    """Levels below which low_pct / high_pct percent of the pixels fall."""
+    c = cdf(hist)
+    total = c[-1]
+    low = int(np.searchsorted(c, total * low_pct / 100.0, side="right"))
+    high = int(np.searchsorted(c, total * high_pct / 100.0, side="left"))
+    return min(low, 255), min(max(high, low + 1), 255)
+
+
+def stretch_lut(low, high):
+    levels = np.arange(256, dtype=np.float64)
+    lut = (levels - low) * 255.0 / max(high - low, 1)
+    return np.clip(np.round(lut), 0, 255).astype(np.uint8)
+
+
+def _on_luma(img, fn):
+    if img.ndim == 2:
+        return fn(img)
+    ycrcb = cv2.cvtColor(img, cv2.COLOR_RGB2YCrCb)
+    ycrcb[:, :, 0] = fn(ycrcb[:, :, 0])
+    return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
+
+
+# ===================== METHODS =====================
+
+def equalize(img):
+    return _on_luma(img, lambda y: apply_lut(y, equalize_lut(histogram(y))))
+
+
+def auto_levels(img, low_pct=1.0, high_pct=99.0):
+    """Stretch so the low/high percentiles of all channels map to 0/255."""
+    flat = np.ascontiguousarray(img).reshape(img.shape[0], -1)
+    hist = histogram(flat)
+    low, high = percentile_levels(hist, low_pct, high_pct)
+    return apply_lut(img, stretch_lut(low, high))
+
+
+def _tile_edges(length, tiles):
+    return np.linspace(0, length, tiles + 1).round().astype(int)
+
+
+def _clahe_tile_lut(tile, clip_limit):
+    hist = histogram(tile)
+    n = tile.size
+    if clip_limit > 0:
+        limit = max(clip_limit * n / 256.0, 1.0)
+        excess = np.maximum(hist - limit, 0).sum()
+        hist = np.minimum(hist, limit) + excess / 256.0
+    lut = np.round(cdf(hist) * 255.0 / max(n, 1))
+    return np.clip(lut, 0, 255).astype(np.float32)
+
+
+def _segments(length, edges):
+    """Split [0, length) at the tile centres; each segment blends tiles i0/i1."""
+    centres = (edges[:-1] + edges[1:]) / 2.0
+    bounds = np.concatenate(([0], np.ceil(centres).astype(int), [length]))
+    last = len(centres) - 1
+    segs = []
+    for j in range(len(bounds) - 1):
+        start, stop = bounds[j], bounds[j + 1]
+        if stop <= start:
+            continue
+        i0, i1 = max(j - 1, 0), min(j, last)
+        pos = np.arange(start, stop, dtype=np.float32)
+        if i0 == i1:
+            weight = np.zeros_like(pos)
+        else:
+            weight = (pos - centres[i0]) / (centres[i1] - centres[i0])
+        segs.append((start, stop, i0, i1, weight))
+    return segs
+
+
+def _gather(levels, dense):
+    return dense[levels]
+
+
+def _clahe_channel(channel, clip_limit, tiles):
+    dtype = channel.dtype
+    h, w = channel.shape
+    ty, tx = tiles
+    ys, xs = _tile_edges(h, ty), _tile_edges(w, tx)
+
+    tile_jobs = [
+        _pool.submit(_clahe_tile_lut, channel[ys[i]:ys[i + 1], xs[j]:xs[j + 1]], clip_limit)
+        for i in range(ty) for j in range(tx)
+    ]
+    luts = [job.result() for job in tile_jobs]
+    if channel.dtype != np.uint8:
+        luts = list(_pool.map(dense_lut, luts))
+        channel = _levels16(channel)
+    luts = [luts[i * tx:(i + 1) * tx] for i in range(ty)]
+
+    out = np.empty(channel.shape, dtype=dtype)
+    lookup = cv2.LUT if dtype == np.uint8 else _gather
+    scale = np.float32(depth.full_scale(dtype) / 255.0)
+    offset = 0.0 if dtype == np.float32 else 0.5
+
+    def blend(rseg, cseg):
+        y0, y1, r0, r1, wy = rseg
+        x0, x1, c0, c1, wx = cseg
+        block = channel[y0:y1, x0:x1]
+        a = lookup(block, luts[r0][c0])
+        b = lookup(block, luts[r0][c1])
+        c = lookup(block, luts[r1][c0])
+        d = lookup(block, luts[r1][c1])
+        # In-place lerps: top row pair into b, bottom pair into d, then rows.
+        b -= a
+        b *= wx[None, :]
+        b += a
+        d -= c
+        d *= wx[None, :]
+        d += c
+        d -= b
+        d *= wy[:, None]
+        d += b
+        if scale != 1:
+            d *= scale
+        d += offset
+        out[y0:y1, x0:x1] = d  # convex blend of in-range values; truncates
+
+    jobs = [
+        _pool.submit(blend, rseg, cseg)
+        for rseg in _segments(h, ys) for cseg in _segments(w, xs)
+    ]
+    for job in jobs:
+        job.result()
+    return out
+
+
+def clahe(img, clip_limit=2.0, tiles=(8, 8)):
+    """Contrast-limited adaptive histogram equalization on luma."""
+    h, w = img.shape[:2]
+    tiles = (max(1, min(tiles[0], h)), max(1, min(tiles[1], w)))
+    return _on_luma(img, lambda y: _clahe_channel(y, clip_limit, tiles))
+
+
+METHODS = {
+    "equalize": equalize,
+    "clahe": clahe,
+    "auto_levels": auto_levels,
+}
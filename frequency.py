@@ -0,0 +1,291 @@
+from functools import lru_cache
+
+import numpy as np
+import cv2
+
+import cache_util
+import depth
+import result_cache
+
+# ===================== FREQUENCY-DOMAIN FILTERING =====================
+#
+# Every filter here is "forward transform, multiply, inverse transform". The
+# forward transform only depends on the image, so it is done once per image
+# and kept in a per-process LRU; changing a cutoff or a kernel then costs one
+# multiply and one inverse transform per channel.
+#
+#   * Images are padded with reflected borders to an FFT-friendly size from
+#     cv2.getOptimalDFTSize, so filtering sees no hard edge and the padding
+#     also absorbs the wrap-around of circular convolution.
+#   * Transforms are cv2.dft on real float32 input, which returns only the
+#     non-redundant half of the spectrum packed in OpenCV's CCS layout;
+#     cv2.mulSpectrums multiplies two CCS spectra directly.
+#   * Real, symmetric transfer functions (low/high/band-pass, Wiener
+#     denominators) are evaluated on a CCS-shaped frequency grid so they can
+#     be applied with a plain element-wise multiply.
+
+SPECTRUM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MIN_MARGIN = 16
+MAX_HALO = 256
+
+_spectra = cache_util.ByteLRU(SPECTRUM_CACHE_MAX_BYTES)
+
+
+# ===================== PADDING & SPECTRA =====================
+
+def _margin_for(radius):
+    """Padding per side; rounded up to a power of two so spectra get reused."""
+    margin = MIN_MARGIN
+    while margin < radius:
+        margin *= 2
+    return margin
+
+
+def padded_size(h, w, margin=MIN_MARGIN):
+    return cv2.getOptimalDFTSize(h + 2 * margin), cv2.getOptimalDFTSize(w + 2 * margin)
+
+
+def _forward(img, margin):
+    h, w = img.shape[:2]
+    ph, pw = padded_size(h, w, margin)
+    padded = cv2.copyMakeBorder(
+        img, margin, ph - h - margin, margin, pw - w - margin, cv2.BORDER_REFLECT_101,
+    )
+    channels = padded[:, :, None] if padded.ndim == 2 else padded
+    out = np.empty((channels.shape[2], ph, pw), dtype=np.float32)
+    for c in range(channels.shape[2]):
+        out[c] = cv2.dft(np.ascontiguousarray(channels[:, :, c], dtype=np.float32))
+    return out
+
+
+def spectrum(img, margin=MIN_MARGIN, key=None):
+    """
+    CCS spectra of the padded channels, shape (channels, ph, pw). `key`
+    identifies the image (its content hash by default).
+    """
+    key = (key or result_cache.content_hash(img), margin)
+    return _spectra.get_or_build(key, lambda: _forward(img, margin))
+
+
+def _inverse(spec, img, margin):
+    h, w = img.shape[:2]
+    out = np.empty(img.shape, dtype=img.dtype)
+    planes = out[:, :, None] if out.ndim == 2 else out
+    high = depth.full_scale(img.dtype) if np.issubdtype(img.dtype, np.integer) else np.inf
+    for c in range(spec.shape[0]):
+        plane = cv2.idft(spec[c], flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE)
+        plane = plane[margin:margin + h, margin:margin + w]
+        if high != np.inf:
+            # Round rather than truncate when going back to integers.
+            plane = plane + 0.5
+        planes[:, :, c] = np.clip(plane, 0, high)
+    return out
+
+
+def clear_spectrum_cache():
+    _spectra.clear()
+
+
+def spectrum_cache_info():
+    return _spectra.info()
+
+
+# ===================== CCS FREQUENCY GRID =====================
+
+@lru_cache(maxsize=8)
+def ccs_frequencies(ph, pw):
+    """
+    Radial frequency (cycles/pixel, 0.5 = Nyquist) of every slot of a CCS
+    spectrum of size ph x pw. Re and Im slots of one frequency share a value.
+    """
+    def packed_index(n):
+        # Slot i of a 1-D CCS row holds frequency (i + 1) // 2, except the
+        # last slot of an even length, which is Nyquist.
+        idx = (np.arange(n) + 1) // 2
+        if n % 2 == 0:
+            idx[-1] = n // 2
+        return idx
+
+    fy = np.minimum(np.arange(ph), ph - np.arange(ph)) / ph
+    fx = packed_index(pw) / pw
+    grid = np.hypot(fy[:, None], fx[None, :])
+
+    # Column 0 (and the Nyquist column of an even width) holds the packed
+    # 1-D CCS of that column along y.
+    cols = [0] + ([pw - 1] if pw % 2 == 0 else [])
+    fy_packed = packed_index(ph) / ph
+    for col in cols:
+        grid[:, col] = np.hypot(fy_packed, fx[col])
+    grid = grid.astype(np.float32)
+    grid.flags.writeable = False
+    return grid
+
+
+def _pair_real(ccs):
+    """
+    For a CCS spectrum whose values are real (Im slots zero), copy each Re
+    slot into its Im partner so it can be applied with an element-wise
+    multiply.
+    """
+    out = ccs.copy()
+    ph, pw = out.shape
+    kmax = (pw - 1) // 2
+    out[:, 2:2 * kmax + 1:2] = out[:, 1:2 * kmax:2]
+    jmax = (ph - 1) // 2
+    for col in [0] + ([pw - 1] if pw % 2 == 0 else []):
+        out[2:2 * jmax + 1:2, col] = out[1:2 * jmax:2, col]
+    return out
+
+
+# ===================== TRANSFER FUNCTIONS =====================
+
+SHAPES = ("ideal", "gaussian", "butterworth")
+
+
+def _lowpass_response(radius, cutoff, shape, order):
+    # cutoff is a fraction of Nyquist, so the response does not depend on
+    # the padded size (or on whether a preview proxy is being filtered).
+    r = radius / (0.5 * max(cutoff, 1e-6))
+    if shape == "ideal":
+        return (r <= 1.0).astype(np.float32)
+    if shape == "gaussian":
+        return np.exp(-0.5 * (r * 2.0) ** 2).astype(np.float32)
+    if shape == "butterworth":
+        return (1.0 / (1.0 + r ** (2 * order))).astype(np.float32)
+    raise ValueError(f"unknown filter shape {shape!r}")
+
+
+@lru_cache(maxsize=16)
+def transfer(kind, ph, pw, cutoff=0.1, low=0.05, high=0.3, shape="butterworth", order=2):
+    """
+    CCS-layout transfer function for "lowpass", "highpass" or "bandpass".
+    High- and band-pass keep the DC term so the result keeps the image's
+    mean brightness and stays viewable.
+    """
+    radius = ccs_frequencies(ph, pw)
+    if kind == "lowpass":
+        response = _lowpass_response(radius, cutoff, shape, order)
+    elif kind == "highpass":
+        response = 1.0 - _lowpass_response(radius, cutoff, shape, order)
+    elif kind == "bandpass":
+        response = _lowpass_response(radius, high, shape, order) * (
+            1.0 - _lowpass_response(radius, low, shape, order)
+        )
+    else:
+        raise ValueError(f"unknown filter kind {kind!r}")
+    response[0, 0] = 1.0
+    response.flags.writeable = False
+    return response
+
+
+def pass_halo(kind, cutoff=0.1, low=0.05, **_):
+    """
+    Pixels of context a pass filter needs around a region: about three
+    spatial sigmas of its lowest cutoff, capped at MAX_HALO.
+    """
+    lowest = low if kind == "bandpass" else cutoff
+    return min(MAX_HALO, int(np.ceil(2.0 / max(lowest, 1e-3))))
+
+
+# ===================== KERNELS =====================
+
+def gaussian_psf(sigma):
+    k = max(3, int(round(sigma * 3)) * 2 + 1)
+    g = cv2.getGaussianKernel(k, sigma)
+    return (g @ g.T).astype(np.float32)
+
+
+def motion_psf(length, angle=0.0):
+    """Normalised line of `length` pixels through the centre at `angle` degrees."""
+    length = max(1, int(length))
+    k = length if length % 2 else length + 1
+    psf = np.zeros((k, k), dtype=np.float32)
+    c = k // 2
+    dx, dy = np.cos(np.deg2rad(angle)), -np.sin(np.deg2rad(angle))
+    half = (length - 1) / 2.0
+    p0 = (int(round(c - dx * half)), int(round(c - dy * half)))
+    p1 = (int(round(c + dx * half)), int(round(c + dy * half)))
+    cv2.line(psf, p0, p1, 1.0, 1)
+    return psf / psf.sum()
+
+
+def disk_kernel(radius):
+    k = 2 * radius + 1
+    disk = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (k, k)).astype(np.float32)
+    return disk / disk.sum()
+
+
+@lru_cache(maxsize=16)
+def _kernel_spectrum_cached(kernel_bytes, kshape, ph, pw):
+    kernel = np.frombuffer(kernel_bytes, dtype=np.float32).reshape(kshape)
+    kh, kw = kshape
+    # Kernel centre at the origin, wrapped around the edges.
+    placed = np.zeros((ph, pw), dtype=np.float32)
+    placed[:kh, :kw] = kernel
+    placed = np.roll(placed, (-(kh // 2), -(kw // 2)), axis=(0, 1))
+    spec = cv2.dft(placed)
+    spec.flags.writeable = False
+    return spec
+
+
+def kernel_spectrum(kernel, ph, pw):
+    kernel = np.ascontiguousarray(kernel, dtype=np.float32)
+    return _kernel_spectrum_cached(kernel.tobytes(), kernel.shape, ph, pw)
+
+
+# ===================== FILTERS =====================
+
+def _apply(img, margin, key, multiply):
+    spec = spectrum(img, margin, key)
+    out = np.empty_like(spec)
+    for c in range(spec.shape[0]):
+        out[c] = multiply(spec[c])
+    return _inverse(out, img, margin)
+
+
+def pass_filter(img, kind, key=None, **params):
+    """Low/high/band-pass on an RGB or gray image; params as in transfer()."""
+    ph, pw = padded_size(*img.shape[:2])
+    response = transfer(kind, ph, pw, **params)
+    return _apply(img, MIN_MARGIN, key, lambda s: cv2.multiply(s, response))
+
+
+def filter2d(img, kernel, key=None):
+    """
+    Same result as cv2.filter2D(img, -1, kernel) (correlation, reflected
+    borders), at a cost that does not depend on the kernel size.
+    """
+    kh, kw = kernel.shape
+    margin = _margin_for(max(kh, kw) // 2)
+    ph, pw = padded_size(*img.shape[:2], margin)
+    kspec = kernel_spectrum(kernel, ph, pw)
+    return _apply(img, margin, key, lambda s: cv2.mulSpectrums(s, kspec, 0, conjB=True))
+
+
+def wiener_deconvolve(img, psf, nsr=0.01, key=None):
+    """
+    Undo a blur by the point-spread function psf with a Wiener filter;
+    nsr is the assumed noise-to-signal power ratio (larger = smoother).
+    """
+    kh, kw = psf.shape
+    margin = _margin_for(max(kh, kw))
+    ph, pw = padded_size(*img.shape[:2], margin)
+    kspec = kernel_spectrum(psf, ph, pw)
+    power = _pair_real(cv2.mulSpectrums(kspec, kspec, 0, conjB=True))
+    gain = 1.0 / (power + np.float32(nsr))
+
+    def multiply(s):
+        return cv2.multiply(cv2.mulSpectrums(s, kspec, 0, conjB=True), gain)
+
+    return _apply(img, margin, key, multiply)
+
+
+def log_magnitude(img, max_side=512):
+    """Centred log-magnitude spectrum of the luma, scaled to uint8 for display."""
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+    h, w = gray.shape
+    scale = min(1.0, max_side / float(max(h, w)))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    mag = np.log1p(np.abs(np.fft.fftshift(np.fft.fft2(gray.astype(np.float32)))))
+    return cv2.normalize(mag, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
@@ -0,0 +1,381 @@
+# ===================== TRANSLATIONS =====================
+#
+# Static UI strings. Kept out of group.py so the tables are built once per
+# process at import instead of on every Streamlit rerun.
+
+TRANSLATIONS = {
+    "en": {
+        "title": "🧮 Matrix Operations for Visual Processing",
+        "subtitle": "🎯 Try 2D matrix effects and image adjustments",
+        "app_goal": "🎯 **App goal:** Provide a practical explanation of how two-dimensional matrix transformations and image filters work on photos using linear algebra concepts.",
+        "features": "- ↩️ Transformations: translate, scale up/down, rotate, shear, and reflect.\n- 🧽 Processing: smooth the image, sharpen details, detect edges, remove background, convert to grayscale, and adjust brightness–contrast.",
+        "concept_1_title": "### 🌀 Two-Dimensional Matrix Transformations",
+        "concept_1_text1": "🌀 A flat image can be viewed as a collection of points \\((x, y)\\) whose positions can be changed by linear operations such as translation, scaling, rotation, shear, and reflection, represented by 2×2 or 3×3 matrices (homogeneous coordinates).",
+        "concept_1_text2": "🔄 When these matrices are multiplied by the point coordinates, the positions shift: scaling changes size, rotation turns the image around a center, shear slants the shape, and reflection flips it across a chosen line.",
+        "concept_2_title": "### 📊 Image Adjustment with Convolution",
+        "concept_2_text1": "📊 Image adjustment uses a small kernel (convolution matrix) that slides across the image; at each position, a new pixel value is computed from a weighted combination of its neighbors.",
+        "concept_2_text2": "🔍 Kernels with more even values create blur or smoothing, while kernels with a strong center and negative surroundings can sharpen and emphasize edges.",
+        "concept_3_title": "### 🎲 Why Make It Interactive?",
+        "concept_3_text1": "🎛️ Users can tune parameters such as rotation angle, scale factors, shear strength, or kernel choice and instantly see the effect on the image, making matrix formulas feel more concrete.",
+        "concept_3_text2": "💡 This way, the numbers inside the matrices can be directly linked to visible changes, so the ideas of linear transformations and convolution become easier to grasp intuitively.",
+        "quick_concepts": "#### 📝 Key Ideas at a Glance",
+        "quick_concepts_text": "- ↩️ 2D transformations: move points on the plane (translation, scaling, rotation, shear, reflection).\n- 📊 Convolution: a small kernel slides over the image to compute each new pixel from its neighborhood.",
+        "upload_title": "### 📷 Upload Image",
+        "upload_label": "Drop an image here (PNG/JPG/JPEG/TIFF) 📂",
+        "upload_success": "✅ Image loaded successfully.",
+        "upload_preview": "📷 Original Image Preview",
+        "upload_info": "⬆️ Please upload an image before using the processing features.",
+        "tools_title": "### 🔧 Image Processing Tools",
+        "tools_subtitle": "🎛️ Choose one of the sections below to set transformations or filters.",
+        "geo_title": "#### 🔄 Geometric Transformations",
+        "geo_desc": "🔄 Geometric transformations change the position, size, and orientation of pixels using matrix-based linear operations.",
+        "btn_translation": "↔️ Translation",
+        "btn_scaling": "📏 Scaling",
+        "btn_rotation": "🔄 Rotation",
+        "btn_shearing": "📐 Shear",
+        "btn_reflection": "🪞 Reflection",
+        "geo_info": "🔔 Upload an image first to try geometric transformations.",
+        "trans_settings": "**↔️ Translation Settings**",
+        "trans_dx": "↔️ dx (shift left–right)",
+        "trans_dy": "↕️ dy (shift up–down)",
+        "btn_apply": "✅ Apply",
+        "trans_result": "📷 Translation Result",
+        "scale_settings": "**📏 Scaling Settings**",
+        "scale_x": "📏 Scale factor for X axis",
+        "scale_y": "📏 Scale factor for Y axis",
+        "scale_result": "📷 Scaling Result",
+        "rot_settings": "**🔄 Rotation Settings**",
+        "rot_angle": "🔄 Rotation angle (degrees)",
+        "rot_result": "📷 Rotation Result",
+        "shear_settings": "**📐 Shear Settings**",
+        "shear_x": "📐 Shear factor X",
+        "shear_y": "📐 Shear factor Y",
+        "shear_result": "📷 Shear Result",
+        "refl_settings": "**🪞 Reflection Settings**",
+        "refl_axis": "🪞 Reflection axis",
+        "refl_result": "📷 Reflection Result",
+        "btn_perspective": "🔳 Perspective",
+        "persp_settings": "**🔳 Perspective Settings**",
+        "persp_x": "🔳 Horizontal tilt (p₁ × 10⁻³)",
+        "persp_y": "🔳 Vertical tilt (p₂ × 10⁻³)",
+        "persp_result": "📷 Perspective Result",
+        "hist_title": "#### 📈 Color Histogram",
+        "hist_desc": "📈 The histogram shows the distribution of pixel intensities (dark to bright) for each color channel and helps assess exposure and contrast.",
+        "btn_histogram": "Show Histogram 📈",
+        "hist_warning": "⚠️ Upload an image first to display the histogram.",
+        "filter_title": "#### 🔧 Filters and Image Adjustments",
+        "filter_desc": "🔧 Filters modify pixel values based on neighboring pixels (convolution) to blur, sharpen, detect edges, remove background, and adjust brightness–contrast.",
+        "btn_blur": "🔲 Blur",
+        "btn_sharpen": "✨ Sharpen",
+        "btn_background": "🎯 Background",
+        "btn_grayscale": "⚫ Grayscale",
+        "btn_edge": "🔍 Edge Detection",
+        "btn_brightness": "☀️ Brightness–Contrast",
+        "filter_info": "🔔 Upload an image first to use filters.",
+        "blur_settings": "**🔲 Blur Settings**",
+        "blur_kernel": "🔲 Kernel size",
+        "blur_result": "📷 Blur Result",
+        "sharpen_settings": "**✨ Sharpen Settings**",
+        "sharpen_desc": "✨ Enhances details and edges in the image.",
+        "sharpen_result": "📷 Sharpen Result",
+        "bg_settings": "**🎯 Background Removal Settings**",
+        "bg_method": "🎯 Method (example using HSV and simple segmentation)",
+        "bg_result": "📷 Background Processing Result",
+        "bg_hue": "🎨 Background hue range",
+        "bg_sat": "💧 Background saturation range",
+        "bg_val": "☀️ Background value range",
+        "bg_cleanup": "🧹 Mask cleanup",
+        "bg_radius": "🧹 Cleanup radius (px)",
+        "btn_morphology": "🧱 Morphology",
+        "morph_settings": "### 🧱 Morphology & Rank Filters",
+        "morph_op": "🛠️ Operation",
+        "morph_op_erode": "Erosion",
+        "morph_op_dilate": "Dilation",
+        "morph_op_opening": "Opening",
+        "morph_op_closing": "Closing",
+        "morph_op_gradient": "Gradient",
+        "morph_op_tophat": "Top-hat",
+        "morph_op_blackhat": "Black-hat",
+        "morph_op_median": "Median",
+        "morph_median_depth": "ℹ️ In 16-bit and float formats the median is limited to radius {radius}: OpenCV has no larger median at those depths, and an 8-bit round trip would posterize the image. Switch the working format to 8-bit for larger windows.",
+        "morph_radius": "📏 Window radius (px)",
+        "morph_target": "🎯 Apply to",
+        "morph_target_image": "Image",
+        "morph_target_mask": "Background mask",
+        "morph_result": "📷 Morphology Result",
+        "morph_mask": "🎭 Filtered mask",
+        "btn_frequency": "🌊 Frequency (FFT)",
+        "freq_settings": "### 🌊 Frequency-Domain Filtering",
+        "freq_desc": "The image's Fourier spectrum is computed once and reused, so changing a setting only multiplies the spectrum by a new filter and transforms back.",
+        "freq_mode": "🛠️ Filter",
+        "freq_mode_lowpass": "Low-pass (smooth)",
+        "freq_mode_highpass": "High-pass (details)",
+        "freq_mode_bandpass": "Band-pass",
+        "freq_mode_blur": "Large disk blur",
+        "freq_mode_deconvolve": "Deblur (Wiener deconvolution)",
+        "freq_shape": "📈 Filter shape",
+        "freq_cutoff": "✂️ Cutoff (fraction of Nyquist)",
+        "freq_band": "✂️ Pass band (fraction of Nyquist)",
+        "freq_order": "🔢 Butterworth order",
+        "freq_disk": "⭕ Disk radius (px)",
+        "freq_psf": "🌫️ Blur to undo",
+        "freq_psf_gaussian": "Gaussian",
+        "freq_psf_motion": "Motion",
+        "freq_sigma": "σ (px)",
+        "freq_length": "📏 Motion length (px)",
+        "freq_angle": "🔄 Motion angle (°)",
+        "freq_nsr": "🔇 Noise-to-signal ratio",
+        "freq_result": "📷 Frequency Filter Result",
+        "freq_spectrum": "🌌 Log-magnitude spectrum of the result",
+        "roi_title": "### 🎯 Region of Interest",
+        "roi_desc": "Limit the transforms and filters below to part of the image. Only the region (plus the few pixels of context a filter needs) is processed, and the result is pasted back into the untouched image.",
+        "roi_mode": "📐 Apply to",
+        "roi_mode_full": "Whole image",
+        "roi_mode_rect": "Rectangle",
+        "roi_mode_foreground": "Foreground (background mask)",
+        "roi_mode_background": "Background (background mask)",
+        "roi_x": "↔️ Horizontal range (%)",
+        "roi_y": "↕️ Vertical range (%)",
+        "roi_mask_hint": "The mask uses the HSV range of the Background Removal tool.",
+        "roi_summary": "🎯 Region {w}×{h} px at ({x}, {y}), {pct:.1f}% of the image",
+        "roi_empty": "⚠️ The region is empty; the whole image will be processed.",
+        "bg_mask_size": "🗜️ Mask: {packed:.1f} KB bit-packed (vs {full:.1f} KB as uint8)",
+        "gray_settings": "**⚫ Grayscale Settings**",
+        "gray_desc": "⚫ Converts a color image into grayscale.",
+        "gray_result": "📷 Grayscale Result",
+        "edge_settings": "**🔍 Edge Detection Settings**",
+        "edge_method": "🔍 Edge detection method",
+        "edge_result": "📷 Edge Image",
+        "bright_settings": "**☀️ Brightness & Contrast Settings**",
+        "bright_brightness": "☀️ Brightness value",
+        "bright_contrast": "🌑 Contrast value",
+        "bright_result": "📷 Brightness–Contrast Result",
+        "bright_method": "☀️ Method",
+        "bright_method_linear": "Linear (α·x + β)",
+        "bright_method_equalize": "Histogram equalization",
+        "bright_method_clahe": "CLAHE (adaptive)",
+        "bright_method_auto_levels": "Auto levels (percentiles)",
+        "clahe_clip": "🧱 CLAHE clip limit",
+        "clahe_tiles": "🧱 CLAHE tiles per side",
+        "levels_pct": "📐 Black / white point percentiles",
+        "team_title": "### 👥 Group Members",
+        "team_subtitle": "👥 Group 3 – Roles and contributions",
+        "team_sid": "🆔 Student ID:",
+        "team_role": "👤 Role:",
+        "team_contribution": "🤝 Contribution:",
+        "upload_method_title": "### 📤 How to Upload an Image",
+        "upload_method_text": "**Steps to upload an image:**\n1. Click the **\"Drop an image here (PNG/JPG/JPEG/TIFF) 📂\"** button at the top of the page.\n2. Choose an image file from your device (PNG, JPG, JPEG, or TIFF).\n3. Wait until the image finishes loading and appears on the screen.\n4. Once successful, a confirmation message and original preview will be shown.\n5. After that, you can use the transformations on the left column and filters on the right.",
+        "team_group": "Group:",
+        "axis_x": "➡️ X-axis",
+        "axis_y": "⬆️ Y-axis",
+        "axis_diag": "↗️ Diagonal",
+        "nav_label": "🧭 Page navigation",
+        "nav_expl": "📖 Explanation",
+        "nav_proc": "🖼️ Upload & Processing",
+        "nav_team": "👥 Team Member",
+        "live_toggle": "🔴 Live preview",
+        "depth_format": "🎚️ Working format",
+        "depth_format_source": "Same as the upload",
+        "depth_format_uint8": "8-bit (uint8)",
+        "depth_format_uint16": "16-bit (uint16)",
+        "depth_format_float32": "32-bit float (float32)",
+        "depth_caption": "Uploaded image: {source} · tools run in: {working}",
+        "depth_note": "Results are only reduced to 8 bits for display and JPG; PNG downloads keep 16 bits.",
+        "live_proxy": "⚡ proxy preview",
+        "live_full": "🖼️ full quality",
+        "live_latency": "⏱️ Change → preview p50: {proxy} · full quality p50: {full}",
+        "wf_title": "### 🔗 Workflow",
+        "wf_desc": "Chain several operations. Each step's result is cached, so changing a step only recomputes that step and the ones after it.",
+        "wf_steps": "🧩 Steps (in order)",
+        "wf_result": "Workflow result",
+        "wf_stats": "📊 Per-step cache hits",
+        "wf_cache": "💾 Held by the step graph (source and cached step results): {mb:.1f} MB",
+    },
+    "id" : {
+        "title": "🔢 Operasi Matriks untuk Pemrosesan Visual",
+        "subtitle": "🎯 Coba efek matriks 2D dan penyesuaian citra",
+        "app_goal": "🎯 **Tujuan aplikasi:** Memberikan penjelasan praktis tentang cara transformasi matriks dua dimensi dan filter citra bekerja pada foto menggunakan konsep aljabar linear.",
+        "features": "- ↩️ Transformasi: translasi, skala, rotasi, shear, dan refleksi.\n- 🧽 Pemrosesan: menghaluskan citra, menajamkan detail, deteksi tepi, menghapus latar belakang, konversi ke grayscale, serta mengatur kecerahan–kontras.",
+        "concept_1_title": "### 🌀 Transformasi Matriks Dua Dimensi",
+        "concept_1_text1": "🌀 Gambar datar dapat dilihat sebagai kumpulan titik \\((x, y)\\) yang posisinya dapat diubah oleh operasi linear seperti translasi, skala, rotasi, shear, dan refleksi, yang direpresentasikan oleh matriks 2×2 atau 3×3 (koordinat homogen).",
+        "concept_1_text2": "🔄 Ketika matriks ini dikalikan dengan koordinat titik, posisi titik bergeser: skala mengubah ukuran, rotasi memutar gambar terhadap pusat, shear membuat bentuk menjadi miring, dan refleksi membalik gambar terhadap garis tertentu.",
+        "concept_2_title": "### 📊 Penyesuaian Citra dengan Konvolusi",
+        "concept_2_text1": "📊 Penyesuaian citra menggunakan kernel kecil (matriks konvolusi) yang digeser di seluruh gambar; pada setiap posisi, nilai piksel baru dihitung dari kombinasi berbobot tetangganya.",
+        "concept_2_text2": "🔍 Kernel dengan nilai yang lebih merata menghasilkan efek blur atau smoothing, sementara kernel dengan pusat kuat dan nilai negatif di sekitarnya dapat menajamkan dan menonjolkan tepi.",
+        "concept_3_title": "### 🎲 Mengapa Interaktif?",
+        "concept_3_text1": "🎛️ Pengguna dapat mengatur parameter seperti sudut rotasi, faktor skala, kekuatan shear, atau pilihan kernel dan langsung melihat hasilnya pada gambar, sehingga rumus matriks terasa lebih konkret.",
+        "concept_3_text2": "💡 Dengan cara ini, angka di dalam matriks bisa langsung dihubungkan dengan perubahan visual, sehingga ide transformasi linear dan konvolusi lebih mudah dipahami secara intuitif.",
+        "quick_concepts": "#### 📝 Ide Utama Singkat",
+        "quick_concepts_text": "- ↩️ Transformasi 2D: memindahkan titik di bidang (translasi, skala, rotasi, shear, refleksi).\n- 📊 Konvolusi: kernel kecil digeser di atas gambar untuk menghitung setiap piksel baru dari lingkungan sekitarnya.",
+        "upload_title": "### 📷 Unggah Gambar",
+        "upload_label": "Letakkan gambar di sini (PNG/JPG/JPEG/TIFF) 📂",
+        "upload_success": "✅ Gambar berhasil dimuat.",
+        "upload_preview": "📷 Pratinjau Gambar Asli",
+        "upload_info": "⬆️ Silakan unggah gambar terlebih dahulu sebelum memakai fitur pemrosesan.",
+        "tools_title": "### 🔧 Image Processing Tools",
+        "tools_subtitle": "🎛️ Pilih salah satu bagian di bawah ini untuk mengatur transformasi atau filter.",
+        "geo_title": "#### 🔄 Transformasi Geometris",
+        "geo_desc": "🔄 Transformasi geometris mengubah posisi, ukuran, dan orientasi piksel menggunakan operasi linear berbasis matriks.",
+        "btn_translation": "↔️ Translasi",
+        "btn_scaling": "📏 Skala",
+        "btn_rotation": "🔄 Rotasi",
+        "btn_shearing": "📐 Shear",
+        "btn_reflection": "🪞 Refleksi",
+        "geo_info": "🔔 Unggah gambar terlebih dahulu untuk mencoba transformasi geometris.",
+        "trans_settings": "**↔️ Pengaturan Translasi**",
+        "trans_dx": "↔️ dx (geser kiri–kanan)",
+        "trans_dy": "↕️ dy (geser atas–bawah)",
+        "btn_apply": "✅ Terapkan",
+        "trans_result": "📷 Hasil Translasi",
+        "scale_settings": "**📏 Pengaturan Skala**",
+        "scale_x": "📏 Faktor skala sumbu X",
+        "scale_y": "📏 Faktor skala sumbu Y",
+        "scale_result": "📷 Hasil Skala",
+        "rot_settings": "**🔄 Pengaturan Rotasi**",
+        "rot_angle": "🔄 Sudut rotasi (derajat)",
+        "rot_result": "📷 Hasil Rotasi",
+        "shear_settings": "**📐 Pengaturan Shear**",
+        "shear_x": "📐 Faktor shear X",
+        "shear_y": "📐 Faktor shear Y",
+        "shear_result": "📷 Hasil Shear",
+        "refl_settings": "**🪞 Pengaturan Refleksi**",
+        "refl_axis": "🪞 Sumbu refleksi",
+        "refl_result": "📷 Hasil Refleksi",
+        "btn_perspective": "🔳 Perspektif",
+        "persp_settings": "**🔳 Pengaturan Perspektif**",
+        "persp_x": "🔳 Kemiringan horizontal (p₁ × 10⁻³)",
+        "persp_y": "🔳 Kemiringan vertikal (p₂ × 10⁻³)",
+        "persp_result": "📷 Hasil Perspektif",
+        "hist_title": "#### 📈 Histogram Warna",
+        "hist_desc": "📈 Histogram menunjukkan sebaran intensitas piksel (gelap ke terang) untuk tiap kanal warna dan membantu menilai eksposur serta kontras.",
+        "btn_histogram": "Tampilkan Histogram 📈",
+        "hist_warning": "⚠️ Unggah gambar terlebih dahulu untuk menampilkan histogram.",
+        "filter_title": "#### 🔧 Filter dan Penyesuaian Citra",
+        "filter_desc": "🔧 Filter mengubah nilai piksel berdasarkan piksel tetangga (konvolusi) untuk blur, sharpening, deteksi tepi, penghapusan latar belakang, dan pengaturan kecerahan–kontras.",
+        "btn_blur": "🔲 Blur",
+        "btn_sharpen": "✨ Tajamkan",
+        "btn_background": "🎯 Background",
+        "btn_grayscale": "⚫ Grayscale",
+        "btn_edge": "🔍 Deteksi Tepi",
+        "btn_brightness": "☀️ Kecerahan–Kontras",
+        "filter_info": "🔔 Unggah gambar terlebih dahulu untuk menggunakan filter.",
+        "blur_settings": "**🔲 Pengaturan Blur**",
+        "blur_kernel": "🔲 Ukuran kernel",
+        "blur_result": "📷 Hasil Blur",
+        "sharpen_settings": "**✨ Pengaturan Penajaman**",
+        "sharpen_desc": "✨ Menonjolkan detail dan tepi pada gambar.",
+        "sharpen_result": "📷 Hasil Penajaman",
+        "bg_settings": "**🎯 Pengaturan Penghapusan Latar Belakang**",
+        "bg_method": "🎯 Metode (contoh menggunakan HSV dan segmentasi sederhana)",
+        "bg_result": "📷 Hasil Pemrosesan Background",
+        "bg_hue": "🎨 Rentang hue latar",
+        "bg_sat": "💧 Rentang saturasi latar",
+        "bg_val": "☀️ Rentang value latar",
+        "bg_cleanup": "🧹 Pembersihan mask",
+        "bg_radius": "🧹 Radius pembersihan (px)",
+        "btn_morphology": "🧱 Morfologi",
+        "morph_settings": "### 🧱 Morfologi & Filter Peringkat",
+        "morph_op": "🛠️ Operasi",
+        "morph_op_erode": "Erosi",
+        "morph_op_dilate": "Dilasi",
+        "morph_op_opening": "Opening",
+        "morph_op_closing": "Closing",
+        "morph_op_gradient": "Gradien",
+        "morph_op_tophat": "Top-hat",
+        "morph_op_blackhat": "Black-hat",
+        "morph_op_median": "Median",
+        "morph_median_depth": "ℹ️ Dalam format 16-bit dan float, median dibatasi pada radius {radius}: OpenCV tidak punya median yang lebih besar untuk kedalaman itu, dan konversi lewat 8 bit akan membuat gambar berpita. Ganti format kerja ke 8-bit untuk jendela yang lebih besar.",
+        "morph_radius": "📏 Radius jendela (px)",
+        "morph_target": "🎯 Terapkan pada",
+        "morph_target_image": "Gambar",
+        "morph_target_mask": "Mask latar belakang",
+        "morph_result": "📷 Hasil Morfologi",
+        "morph_mask": "🎭 Mask hasil filter",
+        "btn_frequency": "🌊 Frekuensi (FFT)",
+        "freq_settings": "### 🌊 Filter Domain Frekuensi",
+        "freq_desc": "Spektrum Fourier gambar dihitung sekali lalu dipakai ulang, sehingga mengubah pengaturan hanya mengalikan spektrum dengan filter baru lalu mentransformasikannya kembali.",
+        "freq_mode": "🛠️ Filter",
+        "freq_mode_lowpass": "Low-pass (menghaluskan)",
+        "freq_mode_highpass": "High-pass (detail)",
+        "freq_mode_bandpass": "Band-pass",
+        "freq_mode_blur": "Blur cakram besar",
+        "freq_mode_deconvolve": "Hilangkan blur (dekonvolusi Wiener)",
+        "freq_shape": "📈 Bentuk filter",
+        "freq_cutoff": "✂️ Cutoff (fraksi Nyquist)",
+        "freq_band": "✂️ Pita lolos (fraksi Nyquist)",
+        "freq_order": "🔢 Orde Butterworth",
+        "freq_disk": "⭕ Radius cakram (px)",
+        "freq_psf": "🌫️ Blur yang dihilangkan",
+        "freq_psf_gaussian": "Gaussian",
+        "freq_psf_motion": "Gerak",
+        "freq_sigma": "σ (px)",
+        "freq_length": "📏 Panjang gerak (px)",
+        "freq_angle": "🔄 Sudut gerak (°)",
+        "freq_nsr": "🔇 Rasio derau terhadap sinyal",
+        "freq_result": "📷 Hasil Filter Frekuensi",
+        "freq_spectrum": "🌌 Spektrum log-magnitudo hasil",
+        "roi_title": "### 🎯 Wilayah Minat (ROI)",
+        "roi_desc": "Batasi transformasi dan filter di bawah pada sebagian gambar. Hanya wilayah tersebut (ditambah beberapa piksel konteks yang dibutuhkan filter) yang diproses, lalu hasilnya ditempelkan kembali ke gambar asli.",
+        "roi_mode": "📐 Terapkan pada",
+        "roi_mode_full": "Seluruh gambar",
+        "roi_mode_rect": "Persegi panjang",
+        "roi_mode_foreground": "Latar depan (mask latar belakang)",
+        "roi_mode_background": "Latar belakang (mask latar belakang)",
+        "roi_x": "↔️ Rentang horizontal (%)",
+        "roi_y": "↕️ Rentang vertikal (%)",
+        "roi_mask_hint": "Mask memakai rentang HSV dari alat Hapus Latar Belakang.",
+        "roi_summary": "🎯 Wilayah {w}×{h} px di ({x}, {y}), {pct:.1f}% dari gambar",
+        "roi_empty": "⚠️ Wilayah kosong; seluruh gambar akan diproses.",
+        "bg_mask_size": "🗜️ Mask: {packed:.1f} KB bit-packed (vs {full:.1f} KB sebagai uint8)",
+        "gray_settings": "**⚫ Pengaturan Grayscale**",
+        "gray_desc": "⚫ Mengubah gambar berwarna menjadi skala abu-abu.",
+        "gray_result": "📷 Hasil Grayscale",
+        "edge_settings": "**🔍 Pengaturan Deteksi Tepi**",
+        "edge_method": "🔍 Metode deteksi tepi",
+        "edge_result": "📷 Gambar Tepi",
+        "bright_settings": "**☀️ Pengaturan Kecerahan & Kontras**",
+        "bright_brightness": "☀️ Nilai kecerahan",
+        "bright_contrast": "🌑 Nilai kontras",
+        "bright_result": "📷 Hasil Kecerahan–Kontras",
+        "bright_method": "☀️ Metode",
+        "bright_method_linear": "Linear (α·x + β)",
+        "bright_method_equalize": "Ekualisasi histogram",
+        "bright_method_clahe": "CLAHE (adaptif)",
+        "bright_method_auto_levels": "Level otomatis (persentil)",
+        "clahe_clip": "🧱 Batas clip CLAHE",
+        "clahe_tiles": "🧱 Jumlah tile CLAHE per sisi",
+        "levels_pct": "📐 Persentil titik hitam / putih",
+        "team_title": "### 👥 Anggota Kelompok",
+        "team_subtitle": "👥 Kelompok 3 – Peran dan kontribusi",
+        "team_sid": "🆔 NIM:",
+        "team_role": "👤 Peran:",
+        "team_contribution": "🤝 Kontribusi:",
+        "upload_method_title": "### 📤 Cara Mengunggah Gambar",
+        "upload_method_text": "**Langkah mengunggah gambar:**\n1. Klik tombol **\"Letakkan gambar di sini (PNG/JPG/JPEG/TIFF) 📂\"** di bagian atas halaman.\n2. Pilih file gambar dari perangkat (PNG, JPG, JPEG, atau TIFF).\n3. Tunggu sampai gambar selesai dimuat dan muncul di layar.\n4. Jika berhasil, pesan konfirmasi dan pratinjau gambar asli akan ditampilkan.\n5. Setelah itu, kamu dapat menggunakan transformasi di kolom kiri dan filter di kolom kanan.",
+        "team_group": "👥 Kelompok:",
+        "axis_x": "➡️ Sumbu-X",
+        "axis_y": "⬆️ Sumbu-Y",
+        "axis_diag": "↗️ Diagonal",
+        "nav_label": "🧭 Navigasi halaman",
+        "nav_expl": "📖 Penjelasan",
+        "nav_proc": "🖼️ Unggah & Pemrosesan",
+        "nav_team": "👥 Anggota",
+        "live_toggle": "🔴 Pratinjau langsung",
+        "depth_format": "🎚️ Format kerja",
+        "depth_format_source": "Sama seperti unggahan",
+        "depth_format_uint8": "8-bit (uint8)",
+        "depth_format_uint16": "16-bit (uint16)",
+        "depth_format_float32": "Float 32-bit (float32)",
+        "depth_caption": "Gambar unggahan: {source} · alat berjalan dalam: {working}",
+        "depth_note": "Hasil hanya diturunkan ke 8 bit untuk tampilan dan JPG; unduhan PNG tetap 16 bit.",
+        "live_proxy": "⚡ pratinjau cepat",
+        "live_full": "🖼️ kualitas penuh",
+        "live_latency": "⏱️ Perubahan → pratinjau p50: {proxy} · kualitas penuh p50: {full}",
+        "wf_title": "### 🔗 Alur Kerja",
+        "wf_desc": "Rangkai beberapa operasi. Hasil setiap langkah disimpan, jadi mengubah satu langkah hanya menghitung ulang langkah itu dan langkah sesudahnya.",
+        "wf_steps": "🧩 Langkah (berurutan)",
+        "wf_result": "Hasil alur kerja",
+        "wf_stats": "📊 Cache hit per langkah",
+        "wf_cache": "💾 Disimpan graf langkah (sumber dan hasil langkah): {mb:.1f} MB",
+    },
+}
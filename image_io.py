@@ -0,0 +1,141 @@
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+
+import numpy as np
+import cv2
+from PIL import Image
+
+import depth
+
+# ===================== IMAGE I/O =====================
+#
+# Upload -> array -> display/download with as few full-frame copies as
+# possible:
+#   * uploads are decoded straight from the UploadedFile buffer (a memoryview,
+#     no bytes copy) and the BGR->RGB swap is done in place;
+#   * dtype conversion is skipped when the array is already uint8;
+#   * 16-bit (and float) sources can be kept at their depth, and PNG/TIFF
+#     exports of uint16/float32 results are written as 16-bit; only JPEG
+#     (and uint8 results) go through 8 bits;
+#   * grayscale results are encoded as "L" instead of being expanded to RGB.
+# Every full-frame allocation this module makes is counted, so track() shows
+# the bytes allocated per request.
+
+_local = threading.local()
+
+
+def _count(kind, nbytes):
+    stats = getattr(_local, "stats", None)
+    if stats is not None:
+        stats[kind] = stats.get(kind, 0) + 1
+        stats["bytes"] += int(nbytes)
+
+
+@contextmanager
+def track():
+    """Collect allocation counts for image I/O done on this thread."""
+    previous = getattr(_local, "stats", None)
+    stats = {"bytes": 0}
+    _local.stats = stats
+    try:
+        yield stats
+    finally:
+        _local.stats = previous
+
+
+# ===================== DECODE =====================
+
+def _file_buffer(file):
+    if hasattr(file, "getbuffer"):
+        return file.getbuffer()
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return file
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            return f.read()
+    file.seek(0)
+    return file.read()
+
+
+def load_image(file, keep_depth=False):
+    """
+    Decode an upload/path/bytes to an RGB uint8 array. With keep_depth,
+    16-bit PNG/TIFF stay uint16 and float TIFF become float32 in [0, 1].
+    """
+    buf = np.frombuffer(_file_buffer(file), dtype=np.uint8)
+    flags = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+    if keep_depth:
+        flags |= cv2.IMREAD_ANYDEPTH
+    img = cv2.imdecode(buf, flags)
+    if img is None:
+        # Formats OpenCV cannot decode fall back to PIL.
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            file = BytesIO(file)
+        img = np.asarray(Image.open(file).convert("RGB"))
+        _count("decode", img.nbytes)
+        return img
+    _count("decode", img.nbytes)
+    cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+    if img.dtype not in (np.uint8, np.uint16):
+        # Float TIFF. Most are in [0, 1]; ones written on an 8- or 16-bit
+        # scale are brought into that range so previews are not blown out.
+        img = img.astype(np.float32, copy=False)
+        peak = float(img.max()) if img.size else 0.0
+        if peak > 1.0:
+            img *= np.float32(1.0 / (255.0 if peak <= 255.0 else 65535.0))
+    return img
+
+
+def as_uint8(arr):
+    """
+    View arr as uint8, converting only when the dtype differs. uint16 and
+    float32 are working formats (see depth.py) and are rescaled; other
+    dtypes are taken to hold 0..255 values.
+    """
+    arr = np.asarray(arr)
+    if arr.dtype == np.uint8:
+        return arr
+    if arr.dtype in (np.uint16, np.float32):
+        out = depth.quantize(arr)
+    else:
+        out = np.clip(arr, 0, 255).astype(np.uint8)
+    _count("astype", out.nbytes)
+    return out
+
+
+# ===================== ENCODE =====================
+
+def _encode(img, fmt):
+    if fmt.upper() in ("PNG", "TIFF") and np.asarray(img).dtype in (np.uint16, np.float32):
+        return _encode_16bit(img, fmt)
+    arr = as_uint8(img)
+    if fmt.upper() == "JPEG" and arr.ndim == 3 and arr.shape[2] == 4:
+        # JPEG has no alpha; transparent pixels become black.
+        alpha = cv2.cvtColor(arr[:, :, 3], cv2.COLOR_GRAY2RGB)
+        arr = cv2.multiply(arr[:, :, :3], alpha, scale=1 / 255.0)
+        _count("flatten_alpha", arr.nbytes)
+    buf = BytesIO()
+    Image.fromarray(np.ascontiguousarray(arr)).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _encode_16bit(img, fmt):
+    # PIL cannot write 16-bit RGB, so these go through OpenCV (BGR order).
+    arr = depth.to_format(np.asarray(img), "uint16")
+    if arr.ndim == 3:
+        code = cv2.COLOR_RGBA2BGRA if arr.shape[2] == 4 else cv2.COLOR_RGB2BGR
+        arr = cv2.cvtColor(arr, code)
+        _count("swap_channels", arr.nbytes)
+    ok, encoded = cv2.imencode("." + fmt.lower(), arr)
+    if not ok:
+        raise ValueError(f"could not encode a 16-bit {fmt} image")
+    return encoded.tobytes()
+
+
+def image_to_bytes(img_rgb, fmt="PNG"):
+    if img_rgb is None:
+        raise ValueError("image_to_bytes received None image")
+    data = _encode(img_rgb, fmt)
+    _count("encode", len(data))
+    return data
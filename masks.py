@@ -0,0 +1,240 @@
+import numpy as np
+import cv2
+
+import morphology
+
+# ===================== COMPACT BINARY MASKS =====================
+#
+# Masks are stored one bit per pixel (np.packbits along each row, MSB first),
+# which is 8x smaller than the uint8 masks cv2.inRange produces. Morphological
+# cleanup works directly on the packed rows: vertical neighbours are row
+# shifts, horizontal neighbours are bit shifts with a carry from the adjacent
+# byte, and eight pixels are processed per byte operation. Large radii switch
+# to van Herk/Gil-Werman (see morphology.py): vertically on the packed bytes
+# with bitwise and/or, horizontally on unpacked row strips, so the cost stops
+# growing with the radius.
+
+VHGW_MIN_RADIUS = 16
+STRIP_ROWS = 256
+
+
+class PackedMask:
+    def __init__(self, bits, shape):
+        self.bits = bits
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_bool(cls, mask):
+        mask = np.asarray(mask)
+        return cls(np.packbits(mask.astype(bool), axis=1), mask.shape)
+
+    @classmethod
+    def zeros(cls, shape):
+        h, w = shape
+        return cls(np.zeros((h, (w + 7) // 8), dtype=np.uint8), shape)
+
+    @staticmethod
+    def nbytes_for(shape):
+        h, w = shape[:2]
+        return h * ((w + 7) // 8)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def to_bool(self, rows=None):
+        bits = self.bits if rows is None else self.bits[rows]
+        return np.unpackbits(bits, axis=1, count=self.shape[1]).astype(bool)
+
+    def to_uint8(self, rows=None):
+        """0/255 mask in the layout OpenCV expects."""
+        bits = self.bits if rows is None else self.bits[rows]
+        return np.unpackbits(bits, axis=1, count=self.shape[1]) * np.uint8(255)
+
+    def count(self):
+        return int(np.unpackbits(self.bits, axis=1, count=self.shape[1]).sum(dtype=np.int64))
+
+    def invert(self):
+        return PackedMask(_clear_padding(~self.bits, self.shape[1]), self.shape)
+
+    def to_rle(self):
+        """Run lengths over the row-major pixels, starting with a background run."""
+        flat = self.to_bool().ravel()
+        change = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+        bounds = np.concatenate(([0], change, [flat.size]))
+        runs = np.diff(bounds)
+        if flat.size and flat[0]:
+            runs = np.concatenate(([0], runs))
+        return runs.astype(np.uint32)
+
+    @classmethod
+    def from_rle(cls, runs, shape):
+        values = np.zeros(len(runs), dtype=bool)
+        values[1::2] = True
+        flat = np.repeat(values, np.asarray(runs, dtype=np.int64))
+        return cls.from_bool(flat.reshape(shape))
+
+
+# ===================== PACKED MORPHOLOGY =====================
+
+def _clear_padding(bits, width):
+    pad = bits.shape[1] * 8 - width
+    if pad:
+        bits = bits.copy() if not bits.flags.writeable else bits
+        bits[:, -1] &= np.uint8((0xFF << pad) & 0xFF)
+    return bits
+
+
+def _shift_right(bits, fill):
+    """Pixel x takes the value of pixel x-1; pixel 0 gets `fill`."""
+    carry = np.empty_like(bits)
+    carry[:, 1:] = (bits[:, :-1] & 1) << 7
+    carry[:, 0] = 0x80 if fill else 0
+    return (bits >> 1) | carry
+
+
+def _shift_left(bits, fill, width):
+    """Pixel x takes the value of pixel x+1; the last pixel gets `fill`."""
+    carry = np.empty_like(bits)
+    carry[:, :-1] = bits[:, 1:] >> 7
+    carry[:, -1] = 0
+    out = (bits << 1) | carry
+    if fill:
+        last = width - 1
+        out[:, last // 8] |= np.uint8(0x80 >> (last % 8))
+    return out
+
+
+def _shift_rows(bits, step, fill):
+    out = np.full_like(bits, 0xFF if fill else 0)
+    if step > 0:
+        out[step:] = bits[:-step]
+    else:
+        out[:step] = bits[-step:]
+    return out
+
+
+def _morph(mask, radius, erode):
+    """Square (2r+1)x(2r+1) erosion or dilation; outside pixels never win."""
+    bits = mask.bits
+    width = mask.shape[1]
+    combine = np.bitwise_and if erode else np.bitwise_or
+    fill = erode
+
+    horiz = bits
+    right = left = bits
+    for _ in range(radius):
+        right = _shift_right(right, fill)
+        left = _shift_left(left, fill, width)
+        horiz = combine(combine(horiz, right), left)
+
+    out = horiz
+    for step in range(1, radius + 1):
+        if step >= bits.shape[0]:
+            break
+        out = combine(out, _shift_rows(horiz, step, fill))
+        out = combine(out, _shift_rows(horiz, -step, fill))
+    return PackedMask(_clear_padding(out, width), mask.shape)
+
+
+def _morph_vhgw(mask, radius, erode):
+    h, w = mask.shape
+    k = 2 * radius + 1
+    horiz = np.empty_like(mask.bits)
+    for y in range(0, h, STRIP_ROWS):
+        strip = mask.to_bool(slice(y, y + STRIP_ROWS))
+        strip = morphology.vhgw(strip, k, 1, np.logical_and if erode else np.logical_or, erode)
+        horiz[y:y + STRIP_ROWS] = np.packbits(strip, axis=1)
+    ufunc, fill = (np.bitwise_and, 0xFF) if erode else (np.bitwise_or, 0)
+    out = morphology.vhgw(horiz, k, 0, ufunc, fill)
+    return PackedMask(_clear_padding(np.ascontiguousarray(out), w), mask.shape)
+
+
+def erode(mask, radius=1):
+    if radius <= 0:
+        return mask
+    if radius >= VHGW_MIN_RADIUS:
+        return _morph_vhgw(mask, radius, erode=True)
+    return _morph(mask, radius, erode=True)
+
+
+def dilate(mask, radius=1):
+    if radius <= 0:
+        return mask
+    if radius >= VHGW_MIN_RADIUS:
+        return _morph_vhgw(mask, radius, erode=False)
+    return _morph(mask, radius, erode=False)
+
+
+def opening(mask, radius=1):
+    return dilate(erode(mask, radius), radius)
+
+
+def closing(mask, radius=1):
+    return erode(dilate(mask, radius), radius)
+
+
+def _and_not(a, b):
+    return PackedMask(a.bits & ~b.bits, a.shape)
+
+
+def gradient(mask, radius=1):
+    """Pixels within radius of the foreground boundary."""
+    return _and_not(dilate(mask, radius), erode(mask, radius))
+
+
+def tophat(mask, radius=1):
+    """Foreground specks removed by an opening."""
+    return _and_not(mask, opening(mask, radius))
+
+
+def blackhat(mask, radius=1):
+    """Holes filled by a closing."""
+    return _and_not(closing(mask, radius), mask)
+
+
+def median(mask, radius=1):
+    """
+    Majority filter, the median of a binary mask. Window counts come from an
+    integral image, so the cost is constant in the radius; only pixels
+    inside the image vote.
+    """
+    if radius <= 0:
+        return mask
+    h, w = mask.shape
+    out = PackedMask.zeros(mask.shape)
+    xs = np.arange(w)
+    cols = np.minimum(xs + radius, w - 1) - np.maximum(xs - radius, 0) + 1
+    for y in range(0, h, STRIP_ROWS):
+        y1 = min(y + STRIP_ROWS, h)
+        lo, hi = max(y - radius, 0), min(y1 + radius, h)
+        sums = cv2.integral(mask.to_uint8(slice(lo, hi)) >> 7)
+        ys = np.arange(y, y1)
+        top = np.maximum(ys - radius, 0) - lo
+        bottom = np.minimum(ys + radius, h - 1) - lo + 1
+        left = np.maximum(xs - radius, 0)
+        right = np.minimum(xs + radius, w - 1) + 1
+        count = (sums[bottom][:, right] - sums[bottom][:, left]
+                 - sums[top][:, right] + sums[top][:, left])
+        rows = (bottom - top)[:, None] * cols[None, :]
+        out.bits[y:y1] = np.packbits(2 * count > rows, axis=1)
+    return out
+
+
+CLEANUPS = {
+    "none": lambda mask, radius: mask,
+    "opening": opening,
+    "closing": closing,
+    "open+close": lambda mask, radius: closing(opening(mask, radius), radius),
+}
+
+OPS = {
+    "erode": erode,
+    "dilate": dilate,
+    "opening": opening,
+    "closing": closing,
+    "gradient": gradient,
+    "tophat": tophat,
+    "blackhat": blackhat,
+    "median": median,
+}
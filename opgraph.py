@@ -0,0 +1,227 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+import enhance
+import ops
+import result_cache
+
+# ===================== OPERATION GRAPH =====================
+#
+# A small DAG whose nodes are the existing ops. A node's cache key is derived
+# from its op, its parameters and the keys of its inputs (the source's key is
+# its content hash), so:
+#   * changing an early parameter changes every downstream key, and those
+#     nodes recompute on the next evaluate();
+#   * changing a late parameter leaves upstream keys untouched, so their
+#     outputs come straight from the cache and are not even visited.
+# Keys are recomputed lazily on evaluate(); nothing is pushed eagerly when a
+# parameter changes.
+
+
+def _translate(img, dx=0, dy=0):
+    return ops.apply_affine_transform(img, ops.translation_matrix(dx, dy))
+
+
+def _scale(img, sx=1.0, sy=1.0):
+    h, w = img.shape[:2]
+    return ops.apply_affine_transform(
+        img, ops.scaling_matrix(sx, sy), output_size=(max(1, int(w * sx)), max(1, int(h * sy))),
+    )
+
+
+def _rotate(img, angle=0):
+    return ops.apply_affine_transform(img, ops.rotation_matrix(angle, img.shape[1], img.shape[0]))
+
+
+def _shear(img, shx=0.0, shy=0.0):
+    return ops.apply_affine_transform(img, ops.shear_matrix(shx, shy))
+
+
+def _blend(a, b, alpha=0.5):
+    if a.shape[:2] != b.shape[:2]:
+        b = cv2.resize(b, (a.shape[1], a.shape[0]), interpolation=cv2.INTER_LINEAR)
+    if a.ndim != b.ndim:
+        a, b = (cv2.cvtColor(x, cv2.COLOR_GRAY2RGB) if x.ndim == 2 else x for x in (a, b))
+    return cv2.addWeighted(a, 1.0 - alpha, b, alpha, 0)
+
+
+OPS = {
+    "translate": _translate,
+    "scale": _scale,
+    "rotate": _rotate,
+    "shear": _shear,
+    "blur": lambda img, k=5: ops.gaussian_blur(img, k),
+    "sharpen": lambda img: ops.sharpen(img),
+    "grayscale": lambda img: ops.rgb_to_gray(img),
+    "edge": lambda img, method="Sobel": ops.edge_detect(img, method),
+    "brightness": lambda img, brightness=0, contrast=0: ops.adjust_brightness_contrast(
+        img, brightness=brightness, contrast=contrast,
+    ),
+    "equalize": lambda img: enhance.equalize(img),
+    "clahe": lambda img, clip=2.0, tiles=8: enhance.clahe(img, clip_limit=clip, tiles=(tiles, tiles)),
+    "blend": _blend,
+}
+
+
+class Node:
+    def __init__(self, name, op, inputs, params):
+        self.name = name
+        self.op = op
+        self.inputs = tuple(inputs)
+        self.params = dict(params)
+        self.hits = 0
+        self.misses = 0
+        self.last_ms = None
+        self.last_key = None
+
+    def signature(self, input_keys):
+        payload = json.dumps([self.op, self.params, list(input_keys)], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class OpGraph:
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nodes = OrderedDict()
+        self._sources = {}
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.RLock()
+
+    # ---------- building ----------
+
+    def set_source(self, name, img, key=None):
+        """Register an input image; `key` defaults to its content hash."""
+        with self._lock:
+            key = key or result_cache.content_hash(img)
+            self._sources[name] = (key, img)
+            self.nodes.pop(name, None)
+
+    def add(self, name, op, inputs, **params):
+        if op not in OPS:
+            raise ValueError(f"unknown op {op!r}")
+        with self._lock:
+            for dep in inputs:
+                if dep not in self.nodes and dep not in self._sources:
+                    raise ValueError(f"node {name!r} depends on unknown node {dep!r}")
+            node = self.nodes.get(name)
+            if node is not None and node.op == op and node.inputs == tuple(inputs):
+                node.params = dict(params)
+            else:
+                self.nodes[name] = Node(name, op, inputs, params)
+            return self.nodes[name]
+
+    def set_params(self, name, **params):
+        with self._lock:
+            self.nodes[name].params.update(params)
+
+    def remove(self, name):
+        with self._lock:
+            self.nodes.pop(name, None)
+
+    def set_chain(self, source, steps):
+        """
+        Make the graph a linear chain source -> steps[0] -> ... and return the
+        last node name. steps is a list of (name, op, params).
+        """
+        with self._lock:
+            wanted = [name for name, _, _ in steps]
+            for name in list(self.nodes):
+                if name not in wanted:
+                    del self.nodes[name]
+            prev = source
+            for name, op, params in steps:
+                self.add(name, op, [prev], **params)
+                prev = name
+            return prev
+
+    # ---------- evaluation ----------
+
+    def key(self, name):
+        if name in self._sources:
+            return self._sources[name][0]
+        node = self.nodes[name]
+        return node.signature(self.key(dep) for dep in node.inputs)
+
+    def evaluate(self, name, _as_input=False):
+        with self._lock:
+            if name in self._sources:
+                return self._sources[name][1]
+            node = self.nodes[name]
+            key = self.key(name)
+            previous, node.last_key = node.last_key, key
+            out = self._cache.get(key)
+            if out is not None:
+                self._cache.move_to_end(key)
+                # Asking again for the result just returned (a page rerun)
+                # reuses nothing; feeding a recompute or returning to an
+                # earlier state does.
+                if _as_input or key != previous:
+                    node.hits += 1
+                return out
+
+            inputs = [self.evaluate(dep, _as_input=True) for dep in node.inputs]
+            t0 = time.perf_counter()
+            out = OPS[node.op](*inputs, **node.params)
+            node.last_ms = (time.perf_counter() - t0) * 1000.0
+            node.misses += 1
+            self._store(key, out)
+            return out
+
+    def _store(self, key, out):
+        if out.nbytes > self.max_bytes:
+            return
+        self._cache[key] = out
+        self._cache_bytes += out.nbytes
+        while self._cache_bytes > self.max_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= old.nbytes
+
+    def is_cached(self, name):
+        return name in self._sources or self.key(name) in self._cache
+
+    def stats(self):
+        with self._lock:
+            rows = []
+            for node in self.nodes.values():
+                total = node.hits + node.misses
+                rows.append({
+                    "node": node.name,
+                    "op": node.op,
+                    "hits": node.hits,
+                    "misses": node.misses,
+                    "hit_rate": node.hits / total if total else None,
+                    "cached": self.is_cached(node.name),
+                    "last_ms": None if node.last_ms is None else round(node.last_ms, 1),
+                })
+            return rows
+
+    def cache_bytes(self):
+        """Bytes the graph keeps alive: cached outputs plus the source images."""
+        with self._lock:
+            return self._cache_bytes + sum(img.nbytes for _, img in self._sources.values())
+
+    def source_key(self, name):
+        entry = self._sources.get(name)
+        return None if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            for node in self.nodes.values():
+                node.hits = node.misses = 0
+                node.last_ms = None
+                node.last_key = None
+
+    def release(self):
+        """Drop cached results and source images; sources must be set again."""
+        with self._lock:
+            self.clear()
+            self._sources.clear()
+
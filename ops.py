@@ -0,0 +1,201 @@
+import numpy as np
+import cv2
+
+import depth
+import masks
+import morphology
+import warp
+
+# ===================== IMAGE OPERATIONS =====================
+#
+# Pure array-in/array-out helpers shared by the Streamlit app (group.py) and
+# the HTTP service (service.py). Images are RGB in one of the working formats
+# of depth.py (uint8 unless the caller picked another) and results keep the
+# input's format; nothing here touches Streamlit.
+
+def translation_matrix(dx, dy):
+    return np.array([[1, 0, dx],
+                     [0, 1, dy],
+                     [0, 0, 1]], dtype=np.float32)
+
+def scaling_matrix(sx, sy):
+    return np.array([[sx, 0, 0],
+                     [0, sy, 0],
+                     [0, 0, 1]], dtype=np.float32)
+
+def rotation_matrix(angle, w, h):
+    cx, cy = w / 2, h / 2
+    theta = np.deg2rad(angle)
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
+    Rm = np.array([[cos_t, -sin_t, 0],
+                   [sin_t,  cos_t, 0],
+                   [0,      0,     1]], dtype=np.float32)
+    T1 = np.array([[1, 0, -cx],
+                   [0, 1, -cy],
+                   [0, 0, 1]], dtype=np.float32)
+    T2 = np.array([[1, 0, cx],
+                   [0, 1, cy],
+                   [0, 0, 1]], dtype=np.float32)
+    return T2 @ Rm @ T1
+
+def shear_matrix(shx, shy):
+    return np.array([[1,   shx, 0],
+                     [shy, 1,   0],
+                     [0,   0,   1]], dtype=np.float32)
+
+def reflection_matrix(axis, w, h):
+    if axis == "x":
+        return np.array([[1, 0, 0],
+                         [0, -1, h],
+                         [0, 0, 1]], dtype=np.float32)
+    if axis == "y":
+        return np.array([[-1, 0, w],
+                         [0, 1, 0],
+                         [0, 0, 1]], dtype=np.float32)
+    return np.array([[0, 1, 0],
+                     [1, 0, 0],
+                     [0, 0, 1]], dtype=np.float32)
+
+def perspective_matrix(px, py, w, h):
+    """Projective tilt about the image centre; px, py are in units of 1e-3."""
+    cx, cy = w / 2, h / 2
+    Pm = np.array([[1, 0, 0],
+                   [0, 1, 0],
+                   [px / 1000, py / 1000, 1]], dtype=np.float64)
+    T1 = np.array([[1, 0, -cx],
+                   [0, 1, -cy],
+                   [0, 0, 1]], dtype=np.float64)
+    T2 = np.array([[1, 0, cx],
+                   [0, 1, cy],
+                   [0, 0, 1]], dtype=np.float64)
+    return T2 @ Pm @ T1
+
+def apply_affine_transform(img_rgb, M, output_size=None):
+    if not warp.is_affine(M):
+        return warp.warp_perspective(img_rgb, M, output_size)
+    h, w = img_rgb.shape[:2]
+    if output_size is None:
+        output_size = (w, h)
+    if M.shape == (3, 3):
+        M_affine = M[0:2, :]
+    else:
+        M_affine = M
+    return cv2.warpAffine(
+        img_rgb, M_affine, output_size,
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REFLECT,
+    )
+
+def gaussian_blur(img_rgb, k):
+    if k % 2 == 0:
+        k += 1
+    return cv2.GaussianBlur(img_rgb, (k, k), 0)
+
+def sharpen(img_rgb):
+    kernel = np.array([[0, -1, 0],
+                       [-1, 5, -1],
+                       [0, -1, 0]], dtype=np.float32)
+    return cv2.filter2D(img_rgb, -1, kernel)
+
+def edge_detect(img_rgb, method="Sobel"):
+    gray = rgb_to_gray(img_rgb)
+    if method == "Sobel":
+        gx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+        gy = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+        mag = cv2.magnitude(gx, gy)
+        return np.clip(mag, 0, depth.full_scale(gray.dtype)).astype(gray.dtype)
+    # Canny only takes 8-bit input; its output is binary anyway.
+    edges = cv2.Canny(depth.quantize(gray), 100, 200)
+    return depth.to_format(edges, depth.format_of(gray))
+
+def manual_convolution_gray(img_gray, kernel):
+    k_h, k_w = kernel.shape
+    pad_h = k_h // 2
+    pad_w = k_w // 2
+    padded = np.pad(img_gray, ((pad_h, pad_h), (pad_w, pad_w)), mode="reflect")
+    h, w = img_gray.shape
+    output = np.zeros_like(img_gray, dtype=np.float32)
+    for i in range(h):
+        for j in range(w):
+            region = padded[i:i + k_h, j:j + k_w]
+            output[i, j] = np.sum(region * kernel)
+    output = np.clip(output, 0, depth.full_scale(img_gray.dtype)).astype(img_gray.dtype)
+    return output
+
+def rgb_to_gray(img_rgb):
+    if img_rgb.ndim == 2:
+        return img_rgb
+    return cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
+
+def adjust_brightness_contrast(img_rgb, brightness=0, contrast=0):
+    beta = brightness
+    alpha = 1 + (contrast / 100.0)
+    if img_rgb.dtype == np.uint8:
+        return cv2.convertScaleAbs(img_rgb, alpha=alpha, beta=beta)
+    # brightness is in 8-bit steps; uint16 saturates, float32 keeps headroom.
+    beta = brightness * depth.full_scale(img_rgb.dtype) / 255.0
+    return cv2.addWeighted(img_rgb, alpha, img_rgb, 0, beta)
+
+def histogram_data(img_rgb):
+    """Per-channel 256-bin counts over the full range, keyed by channel letter."""
+    value_range = depth.hist_range(img_rgb.dtype)
+    return {
+        col: cv2.calcHist([img_rgb], [i], None, [256], value_range).ravel()
+        for i, col in ((2, "b"), (1, "g"), (0, "r"))
+    }
+
+BG_HSV_LOWER = (0, 0, 180)      # low saturation, high value
+BG_HSV_UPPER = (180, 60, 255)
+BG_STRIP_ROWS = 256
+
+def background_mask(img_rgb, lower=BG_HSV_LOWER, upper=BG_HSV_UPPER):
+    """Packed foreground mask: pixels outside the HSV background range."""
+    h, w = img_rgb.shape[:2]
+    lower_bg = np.array(lower, dtype=np.uint8)
+    upper_bg = np.array(upper, dtype=np.uint8)
+
+    # Threshold in row strips so no full-size HSV copy or uint8 mask is held.
+    # The HSV bounds are 8-bit, so deeper strips are quantized first.
+    fg = masks.PackedMask.zeros((h, w))
+    for y in range(0, h, BG_STRIP_ROWS):
+        hsv = cv2.cvtColor(depth.quantize(img_rgb[y:y + BG_STRIP_ROWS]), cv2.COLOR_RGB2HSV)
+        mask_bg = cv2.inRange(hsv, lower_bg, upper_bg)
+        fg.bits[y:y + BG_STRIP_ROWS] = np.packbits(mask_bg == 0, axis=1)
+    return fg
+
+
+def cutout(img_rgb, fg):
+    """RGBA copy of img_rgb whose alpha is the packed mask fg."""
+    h = img_rgb.shape[0]
+    fmt = depth.format_of(img_rgb)
+    rgba = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2RGBA)
+    for y in range(0, h, BG_STRIP_ROWS):
+        rgba[y:y + BG_STRIP_ROWS, :, 3] = depth.to_format(fg.to_uint8(slice(y, y + BG_STRIP_ROWS)), fmt)
+    return rgba
+
+
+def simple_background_removal_hsv(img_rgb, lower=BG_HSV_LOWER, upper=BG_HSV_UPPER,
+                                  cleanup="none", radius=1):
+    """
+    Simple background removal using HSV threshold.
+    Assumes background is relatively light and near-neutral.
+    Returns an RGBA image whose alpha is 0 on the background, and the
+    foreground mask packed to one bit per pixel.
+    """
+    fg = masks.CLEANUPS[cleanup](background_mask(img_rgb, lower, upper), radius)
+    return cutout(img_rgb, fg), fg
+
+
+def morphology_filter(img_rgb, op, radius=1):
+    """Morphology or median filter (see morphology.OPS) on the image itself."""
+    return morphology.OPS[op](img_rgb, radius)
+
+
+def mask_morphology(img_rgb, op, radius=1, lower=BG_HSV_LOWER, upper=BG_HSV_UPPER):
+    """
+    The same filter applied to the background-removal mask instead of the
+    pixels; returns (rgba, PackedMask) like simple_background_removal_hsv.
+    """
+    fg = masks.OPS[op](background_mask(img_rgb, lower, upper), radius)
+    return cutout(img_rgb, fg), fg
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import cv2
+
+# ===================== LIVE PREVIEW =====================
+#
+# While a slider is moving, every value change renders a cheap preview from a
+# downscaled proxy of the original. Once the value has held still for
+# DEBOUNCE_SECONDS the full-resolution result is computed on a background
+# worker; a newer value cancels or discards any full render still in flight,
+# so only the result matching the current sliders is ever shown.
+
+PROXY_MAX_SIDE = 512
+DEBOUNCE_SECONDS = 0.35
+POLL_SECONDS = 0.2
+LATENCY_HISTORY = 50
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preview")
+
+
+def make_proxy(img, max_side=PROXY_MAX_SIDE):
+    """Downscale so the longer side is at most max_side; returns (proxy, scale)."""
+    h, w = img.shape[:2]
+    scale = min(1.0, max_side / float(max(h, w)))
+    if scale >= 1.0:
+        return img, 1.0
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA), scale
+
+
+class PreviewState:
+    """Per-session, per-tool debounce state and latency record."""
+
+    def __init__(self):
+        self.params = None
+        self.changed_at = 0.0
+        self.full_params = None
+        self.full_result = None
+        self.full_shown = False
+        self.proxy_params = None
+        self.proxy_result = None
+        self._future = None
+        self._future_params = None
+        self._lock = threading.RLock()
+        self.proxy_latencies = deque(maxlen=LATENCY_HISTORY)
+        self.full_latencies = deque(maxlen=LATENCY_HISTORY)
+
+    def update(self, params):
+        """Record the current slider values; returns True when they changed."""
+        if params == self.params:
+            return False
+        self.params = params
+        self.changed_at = time.perf_counter()
+        self.full_shown = False
+        with self._lock:
+            if self._future is not None and self._future_params != params:
+                self._future.cancel()
+                self._future = None
+                self._future_params = None
+        return True
+
+    def settled(self):
+        return time.perf_counter() - self.changed_at >= DEBOUNCE_SECONDS
+
+    def submit_full(self, compute, img):
+        with self._lock:
+            if self._future is not None or self.full_params == self.params:
+                return
+            params = self.params
+            self._future_params = params
+            self._future = _executor.submit(compute, img)
+            self._future.add_done_callback(lambda fut: self._finish(fut, params))
+
+    def _finish(self, fut, params):
+        with self._lock:
+            if fut is not self._future:
+                return
+            self._future = None
+            self._future_params = None
+            if fut.cancelled() or fut.exception() is not None or params != self.params:
+                return
+            self.full_params = params
+            self.full_result = fut.result()
+
+    def full_for_current(self):
+        if self.full_params == self.params:
+            return self.full_result
+        return None
+
+    def proxy_for_current(self, compute):
+        """Proxy result for the current values, computed once per change."""
+        if self.proxy_params != self.params:
+            self.proxy_result = compute()
+            self.proxy_params = self.params
+            self.proxy_latencies.append(time.perf_counter() - self.changed_at)
+        return self.proxy_result
+
+    def record_full(self):
+        if not self.full_shown:
+            self.full_latencies.append(time.perf_counter() - self.changed_at)
+            self.full_shown = True
+
+    def nbytes(self):
+        return sum(r.nbytes for r in (self.full_result, self.proxy_result) if r is not None)
+
+    def release(self):
+        """Drop held renders; they are recomputed on the next update."""
+        with self._lock:
+            self.full_params = self.full_result = None
+            self.proxy_params = self.proxy_result = None
+
+    def latency_summary(self):
+        def stats(values):
+            if not values:
+                return None
+            arr = np.asarray(values) * 1000.0
+            return {"last_ms": float(arr[-1]), "p50_ms": float(np.percentile(arr, 50)),
+                    "p95_ms": float(np.percentile(arr, 95)), "n": len(arr)}
+        return {"proxy": stats(self.proxy_latencies), "full": stats(self.full_latencies)}
@@ -0,0 +1,1014 @@
+import math
+from functools import partial
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import depth
+import enhance
+import frequency
+import image_io
+import masks
+import morphology
+import opgraph
+import preview
+import result_cache
+import roi
+import session_memory
+from ops import (
+    BG_HSV_LOWER, BG_HSV_UPPER, background_mask,
+    translation_matrix, scaling_matrix, rotation_matrix, shear_matrix,
+    reflection_matrix, perspective_matrix, apply_affine_transform,
+    gaussian_blur, sharpen, edge_detect, rgb_to_gray, adjust_brightness_contrast,
+    histogram_data, simple_background_removal_hsv, morphology_filter, mask_morphology,
+)
+
+# ===================== UPLOAD & PROCESSING PAGE =====================
+#
+# group.py imports this module only when the processing page is shown, so
+# the Explanation and Team pages never load OpenCV or the image operations.
+# Being a regular module, it is also compiled once per process instead of
+# being part of the main script Streamlit parses and rewrites.
+
+# ===================== SESSION STATE =====================
+
+# Image arrays are kept in session_memory, which holds every session's arrays
+# under one process-wide byte budget and compresses or spills idle ones;
+# session_state only keeps small metadata.
+#
+# "original_img" is the upload at its own depth. Every tool works on it
+# converted to the working format picked on the page (see depth.py), kept
+# as "working_img"; original_hash is the hash of that working image.
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def get_original():
+    """The uploaded image in the working format."""
+    store = session_memory.default_store()
+    src = store.get(session_id(), "original_img")
+    fmt = st.session_state.get("working_format", "source")
+    if src is None or fmt in ("source", depth.format_of(src)):
+        return src
+    work = store.get(session_id(), "working_img")
+    if work is None or depth.format_of(work) != fmt:
+        work = depth.to_format(src, fmt)
+        store.put(session_id(), "working_img", work)
+    return work
+
+def set_original(img):
+    store = session_memory.default_store()
+    store.put(session_id(), "original_img", img)
+    store.put(session_id(), "working_img", None)
+    st.session_state["original_hash"] = None
+
+def original_hash():
+    if st.session_state["original_hash"] is None:
+        st.session_state["original_hash"] = result_cache.content_hash(get_original())
+    return st.session_state["original_hash"]
+
+def working_format_changed():
+    st.session_state["original_hash"] = None
+
+# ===================== HELPER FUNCTIONS =====================
+
+# Decoding and encoding live in image_io and the array operations in ops, so
+# the HTTP service can share them without importing Streamlit.
+load_image = image_io.load_image
+image_to_bytes = image_io.image_to_bytes
+
+def cached_result(op, compute, **params):
+    """Look up (original image, op, params) in the on-disk cache, computing on miss."""
+    key = result_cache.make_key(original_hash(), op, **params)
+    return key, result_cache.default_cache().get_or_compute(key, compute)
+
+def cached_image_bytes(key, img, fmt="PNG"):
+    return result_cache.default_cache().get_or_encode(key, fmt, lambda: image_to_bytes(img, fmt))
+
+def cached_display_bytes(key, img):
+    """8-bit PNG for st.image; the download PNG itself when img is already uint8."""
+    if depth.format_of(img) == "uint8":
+        return cached_image_bytes(key, img, "PNG")
+    return result_cache.default_cache().get_or_encode(
+        key + "-8bit", "PNG", lambda: image_to_bytes(depth.quantize(img), "PNG"),
+    )
+
+def compute_histogram(img_rgb):
+    # A bare Figure avoids pyplot's global state and its slow import; it is
+    # only loaded the first time a histogram is requested.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    for col, hist in histogram_data(img_rgb).items():
+        ax.plot(hist, color=col)
+        ax.set_xlim([0, 256])
+    ax.set_title("Color Histogram")
+    ax.set_xlabel("Pixel value")
+    ax.set_ylabel("Frequency")
+    fig.tight_layout()
+    return fig
+
+def get_proxy_image():
+    """Downscaled copy of original_img used while sliders are moving."""
+    original_hash()
+    store = session_memory.default_store()
+    meta = st.session_state.get("proxy_meta")
+    proxy_img = store.get(session_id(), "proxy_img")
+    if proxy_img is None or meta is None or meta[0] != st.session_state["original_hash"]:
+        proxy_img, scale = preview.make_proxy(get_original())
+        store.put(session_id(), "proxy_img", proxy_img)
+        meta = st.session_state["proxy_meta"] = (st.session_state["original_hash"], scale)
+    return proxy_img, meta[1]
+
+def background_settings():
+    """HSV range and cleanup currently set in the background removal tool."""
+    bg_h = st.session_state.get("bg_h", (BG_HSV_LOWER[0], BG_HSV_UPPER[0]))
+    bg_s = st.session_state.get("bg_s", (BG_HSV_LOWER[1], BG_HSV_UPPER[1]))
+    bg_v = st.session_state.get("bg_v", (BG_HSV_LOWER[2], BG_HSV_UPPER[2]))
+    lower = (bg_h[0], bg_s[0], bg_v[0])
+    upper = (bg_h[1], bg_s[1], bg_v[1])
+    return lower, upper, st.session_state.get("bg_cleanup", "none"), st.session_state.get("bg_radius", 2)
+
+def mask_region(img, mode):
+    """Region covering the foreground (or background) of the background mask."""
+    lower, upper, cleanup, radius = background_settings()
+    key = (original_hash(), mode, lower, upper, cleanup, radius)
+    # The packed bits go to the session store like the other arrays; the
+    # rectangle is small enough for session_state.
+    store = session_memory.default_store()
+    meta = st.session_state.get("roi_mask_meta")
+    bits = store.get(session_id(), "roi_mask_bits")
+    if meta is None or meta[0] != key or (meta[1] is not None and bits is None):
+        fg = masks.CLEANUPS[cleanup](background_mask(img, lower, upper), radius)
+        region = roi.Region.from_mask(fg if mode == "foreground" else fg.invert())
+        if region is None:
+            store.put(session_id(), "roi_mask_bits", None)
+            st.session_state["roi_mask_meta"] = (key, None)
+            return None
+        store.put(session_id(), "roi_mask_bits", region.mask.bits)
+        st.session_state["roi_mask_meta"] = (key, (region.x, region.y, region.w, region.h))
+        return region
+    if meta[1] is None:
+        return None
+    x, y, w, h = meta[1]
+    return roi.Region(x, y, w, h, img.shape, masks.PackedMask(bits, (h, w)))
+
+def region_controls(t, img):
+    """ROI selector shared by the transforms and filters; None means the whole image."""
+    with st.container(border=True):
+        st.markdown(t["roi_title"])
+        st.write(t["roi_desc"])
+        mode = st.radio(
+            t["roi_mode"],
+            ["full", "rect", "foreground", "background"],
+            format_func=lambda m: t[f"roi_mode_{m}"],
+            horizontal=True,
+            key="roi_mode",
+        )
+        if mode == "full":
+            return None
+        if mode == "rect":
+            xs = st.slider(t["roi_x"], 0, 100, (25, 75), key="roi_x")
+            ys = st.slider(t["roi_y"], 0, 100, (25, 75), key="roi_y")
+            region = roi.Region.from_fractions((xs[0] / 100, xs[1] / 100), (ys[0] / 100, ys[1] / 100), img.shape)
+        else:
+            st.caption(t["roi_mask_hint"])
+            region = mask_region(img, mode)
+        if region is None:
+            st.warning(t["roi_empty"])
+        else:
+            st.caption(t["roi_summary"].format(
+                w=region.w, h=region.h, x=region.x, y=region.y, pct=100 * region.fraction,
+            ))
+        return region
+
+def region_for(img, region):
+    """region on img, which may be the preview proxy rather than original_img."""
+    if region is None or img.shape[:2] == region.frame:
+        return region
+    return region.scaled(img.shape)
+
+def restrict(compute, region, halo=0):
+    """Wrap compute(img, scale) so it only processes region plus halo pixels."""
+    if region is None:
+        return compute
+    return lambda img, s: roi.apply(
+        img, lambda patch: compute(patch, s), region_for(img, region), int(math.ceil(halo * s)),
+    )
+
+def format_latency(summary):
+    return "–" if summary is None else f"{summary['p50_ms']:.0f} ms"
+
+def live_preview_panel(t, op, params, compute, caption):
+    """
+    Debounced live preview. compute(img, scale) renders the op on img, where
+    scale is the size of img relative to original_img.
+    """
+    states = st.session_state.setdefault("live_preview_states", {})
+    state = states.get(op)
+    if state is None:
+        state = states[op] = preview.PreviewState()
+    # On every run: the store forgets a session's caches when it expires it,
+    # while st.session_state (and this state) can outlive that.
+    session_memory.default_store().register_cache(session_id(), f"preview:{op}", state.nbytes, state.release)
+    get_proxy_image()
+    state.update((original_hash(), params))
+    polling = state.full_for_current() is None
+    run_every = preview.POLL_SECONDS if polling else None
+    st.fragment(run_every=run_every)(live_preview_body)(t, state, compute, caption, polling)
+
+def live_preview_body(t, state, compute, caption, polling):
+    full = state.full_for_current()
+    if full is not None and polling:
+        # Full render landed; rerun once so the panel stops polling.
+        st.rerun()
+    if full is not None:
+        state.record_full()
+        st.image(depth.quantize(full), caption=f"{caption} · {t['live_full']}", use_column_width=True)
+    else:
+        proxy_img, scale = get_proxy_image()
+        out = state.proxy_for_current(lambda: compute(proxy_img, scale))
+        st.image(depth.quantize(out), caption=f"{caption} · {t['live_proxy']}", use_column_width=True)
+        if state.settled():
+            state.submit_full(lambda img: compute(img, 1.0), get_original())
+
+    summary = state.latency_summary()
+    st.caption(t["live_latency"].format(
+        proxy=format_latency(summary["proxy"]), full=format_latency(summary["full"]),
+    ))
+
+# Workflow steps: op name in opgraph.OPS -> label key and (param, min, max, default, step) sliders.
+WORKFLOW_STEPS = {
+    "translate": ("btn_translation", [("dx", -200, 200, 0, 1), ("dy", -200, 200, 0, 1)]),
+    "scale": ("btn_scaling", [("sx", 0.1, 3.0, 1.0, 0.1), ("sy", 0.1, 3.0, 1.0, 0.1)]),
+    "rotate": ("btn_rotation", [("angle", -180, 180, 0, 1)]),
+    "shear": ("btn_shearing", [("shx", -1.0, 1.0, 0.0, 0.05), ("shy", -1.0, 1.0, 0.0, 0.05)]),
+    "blur": ("btn_blur", [("k", 1, 31, 5, 2)]),
+    "sharpen": ("btn_sharpen", []),
+    "grayscale": ("btn_grayscale", []),
+    "edge": ("btn_edge", []),
+    "brightness": ("btn_brightness", [("brightness", -100, 100, 0, 1), ("contrast", -100, 100, 0, 1)]),
+    "equalize": ("bright_method_equalize", []),
+    "clahe": ("bright_method_clahe", [("clip", 0.5, 8.0, 2.0, 0.5), ("tiles", 2, 16, 8, 1)]),
+}
+
+def get_op_graph():
+    """Session's OpGraph with original_img registered as its "original" source."""
+    graph = st.session_state.get("op_graph")
+    if graph is None:
+        graph = st.session_state["op_graph"] = opgraph.OpGraph()
+    session_memory.default_store().register_cache(session_id(), "op_graph", graph.cache_bytes, graph.release)
+    # Also re-registers after the memory manager released the graph.
+    if graph.source_key("original") != original_hash():
+        graph.set_source("original", get_original(), key=original_hash())
+    return graph
+
+# ===================== PAGE =====================
+
+def render(t):
+    session_memory.default_store().touch(session_id())
+
+    if "original_hash" not in st.session_state:
+        st.session_state["original_hash"] = None
+    if "original_file_id" not in st.session_state:
+        st.session_state["original_file_id"] = None
+    if "geo_transform" not in st.session_state:
+        st.session_state["geo_transform"] = None
+    if "image_filter" not in st.session_state:
+        st.session_state["image_filter"] = None
+
+    with st.container(border=True):
+        st.markdown(t["upload_title"])
+        uploaded_file = st.file_uploader(
+            label=t["upload_label"],
+            type=["png", "jpg", "jpeg", "tif", "tiff"],
+            key="image_uploader_main",
+        )
+        if uploaded_file is not None:
+            if st.session_state["original_file_id"] != uploaded_file.file_id or get_original() is None:
+                set_original(load_image(uploaded_file, keep_depth=True))
+                st.session_state["original_file_id"] = uploaded_file.file_id
+            st.success(t["upload_success"])
+            # Streamlit re-encodes uploaded bytes with PIL anyway, which fails for
+            # inputs the loader accepts (16-bit grayscale PNG, float TIFF), so show
+            # the decoded array at 8 bits instead.
+            source_img = session_memory.default_store().get(session_id(), "original_img")
+            st.image(image_io.as_uint8(source_img), caption=t["upload_preview"], use_column_width=True)
+        else:
+            st.info(t["upload_info"])
+
+    original_img = get_original()
+
+    st.markdown(t["tools_title"])
+    st.write(t["tools_subtitle"])
+    live_mode = st.toggle(t["live_toggle"], key="live_preview")
+    st.selectbox(
+        t["depth_format"],
+        ["source", *depth.FORMATS],
+        format_func=lambda f: t[f"depth_format_{f}"],
+        key="working_format",
+        on_change=working_format_changed,
+    )
+    source_img = session_memory.default_store().get(session_id(), "original_img")
+    if source_img is not None:
+        st.caption(t["depth_caption"].format(
+            source=t[f"depth_format_{depth.format_of(source_img)}"],
+            working=t[f"depth_format_{depth.format_of(original_img)}"],
+        ))
+        if depth.format_of(original_img) != "uint8":
+            st.caption(t["depth_note"])
+
+    with st.container(border=True):
+        st.markdown(t["upload_method_title"])
+        st.markdown(t["upload_method_text"])
+
+    region = None if original_img is None else region_controls(t, original_img)
+    # Appended to cache keys and live preview params so results for
+    # different regions never collide.
+    region_key = None if region is None else region.key()
+    roi_params = {} if region is None else {"roi": region_key}
+
+    tools_col_left, tools_col_right = st.columns(2, vertical_alignment="top")
+
+    # LEFT: Geometric transforms
+    with tools_col_left:
+        with st.container(border=True):
+            st.markdown(t["geo_title"])
+            st.write(t["geo_desc"])
+            st.markdown("---")
+
+            row1 = st.columns(3)
+            with row1[0]:
+                if st.button(t["btn_translation"], key="btn_trans", type="secondary"):
+                    st.session_state["geo_transform"] = "translation"
+            with row1[1]:
+                if st.button(t["btn_scaling"], key="btn_scale", type="secondary"):
+                    st.session_state["geo_transform"] = "scaling"
+            with row1[2]:
+                if st.button(t["btn_rotation"], key="btn_rot", type="secondary"):
+                    st.session_state["geo_transform"] = "rotation"
+
+            row2 = st.columns(3)
+            with row2[0]:
+                if st.button(t["btn_shearing"], key="btn_shear", type="secondary"):
+                    st.session_state["geo_transform"] = "shearing"
+            with row2[1]:
+                if st.button(t["btn_reflection"], key="btn_refl", type="secondary"):
+                    st.session_state["geo_transform"] = "reflection"
+            with row2[2]:
+                if st.button(t["btn_perspective"], key="btn_persp", type="secondary"):
+                    st.session_state["geo_transform"] = "perspective"
+
+        with st.container(border=True):
+            if original_img is None:
+                st.info(t["geo_info"])
+            else:
+                mode = st.session_state["geo_transform"]
+
+                if mode == "translation":
+                    st.markdown(t["trans_settings"])
+                    dx = st.slider(t["trans_dx"], -200, 200, 0, key="dx")
+                    dy = st.slider(t["trans_dy"], -200, 200, 0, key="dy")
+                    if live_mode:
+                        live_preview_panel(
+                            t, "translation", (dx, dy, region_key),
+                            lambda img, s: roi.warp(img, translation_matrix(dx * s, dy * s), region_for(img, region)),
+                            t["trans_result"],
+                        )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_trans"):
+                        Tm = translation_matrix(dx, dy)
+                        key, out = cached_result(
+                            "translation", lambda: roi.warp(original_img, Tm, region), dx=dx, dy=dy, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["trans_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="translation.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="translation.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif mode == "scaling":
+                    st.markdown(t["scale_settings"])
+                    sx = st.slider(t["scale_x"], 0.1, 3.0, 1.0, key="sx")
+                    sy = st.slider(t["scale_y"], 0.1, 3.0, 1.0, key="sy")
+                    if live_mode:
+                        live_preview_panel(
+                            t, "scaling", (sx, sy),
+                            lambda img, s: apply_affine_transform(
+                                img, scaling_matrix(sx, sy),
+                                output_size=(int(img.shape[1] * sx), int(img.shape[0] * sy)),
+                            ),
+                            t["scale_result"],
+                        )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_scale"):
+                        h, w = original_img.shape[:2]
+                        Sm = scaling_matrix(sx, sy)
+                        new_w = int(w * sx)
+                        new_h = int(h * sy)
+                        key, out = cached_result(
+                            "scaling",
+                            lambda: apply_affine_transform(original_img, Sm, output_size=(new_w, new_h)),
+                            sx=sx, sy=sy,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["scale_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="scaling.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="scaling.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif mode == "rotation":
+                    st.markdown(t["rot_settings"])
+                    angle = st.slider(t["rot_angle"], -180, 180, 0, key="angle")
+                    if live_mode:
+                        live_preview_panel(
+                            t, "rotation", (angle, region_key),
+                            lambda img, s: roi.warp(
+                                img, rotation_matrix(angle, img.shape[1], img.shape[0]), region_for(img, region),
+                            ),
+                            t["rot_result"],
+                        )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_rot"):
+                        h, w = original_img.shape[:2]
+                        M = rotation_matrix(angle, w, h)
+                        key, out = cached_result(
+                            "rotation", lambda: roi.warp(original_img, M, region), angle=angle, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["rot_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="rotation.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="rotation.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif mode == "shearing":
+                    st.markdown(t["shear_settings"])
+                    shx = st.slider(t["shear_x"], -1.0, 1.0, 0.0, key="shx")
+                    shy = st.slider(t["shear_y"], -1.0, 1.0, 0.0, key="shy")
+                    if live_mode:
+                        live_preview_panel(
+                            t, "shearing", (shx, shy, region_key),
+                            lambda img, s: roi.warp(img, shear_matrix(shx, shy), region_for(img, region)),
+                            t["shear_result"],
+                        )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_shear"):
+                        Sm = shear_matrix(shx, shy)
+                        key, out = cached_result(
+                            "shearing", lambda: roi.warp(original_img, Sm, region), shx=shx, shy=shy, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["shear_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="shear.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="shear.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif mode == "reflection":
+                    st.markdown(t["refl_settings"])
+                    axis = st.selectbox(
+                        t["refl_axis"],
+                        [t["axis_x"], t["axis_y"], t["axis_diag"]],
+                        key="axis_ref",
+                    )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_ref"):
+                        h, w = original_img.shape[:2]
+                        axis_code = {t["axis_x"]: "x", t["axis_y"]: "y"}.get(axis, "diag")
+                        Rf = reflection_matrix(axis_code, w, h)
+                        key, out = cached_result(
+                            "reflection", lambda: roi.warp(original_img, Rf, region), axis=axis_code, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["refl_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="reflection.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="reflection.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif mode == "perspective":
+                    st.markdown(t["persp_settings"])
+                    px = st.slider(t["persp_x"], -2.0, 2.0, 0.0, step=0.05, key="persp_px")
+                    py = st.slider(t["persp_y"], -2.0, 2.0, 0.0, step=0.05, key="persp_py")
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_persp"):
+                        h, w = original_img.shape[:2]
+                        M = perspective_matrix(px, py, w, h)
+                        key, out = cached_result(
+                            "perspective", lambda: roi.warp(original_img, M, region), px=px, py=py, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["persp_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="perspective.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="perspective.jpg",
+                                mime="image/jpeg",
+                            )
+
+        with st.container(border=True):
+            st.markdown(t["hist_title"])
+            st.write(t["hist_desc"])
+            show_hist = st.button(t["btn_histogram"], key="btn_histogram", type="secondary")
+            if show_hist:
+                if original_img is not None:
+                    hist_fig = compute_histogram(original_img)
+                    st.pyplot(hist_fig)
+                else:
+                    st.warning(t["hist_warning"])
+
+    # RIGHT: Filters
+    with tools_col_right:
+        with st.container(border=True):
+            st.markdown(t["filter_title"])
+            st.write(t["filter_desc"])
+            st.markdown("---")
+
+            filter_col1, filter_col2, filter_col3 = st.columns(3)
+            with filter_col1:
+                if st.button(t["btn_blur"], key="btn_blur_click", type="secondary"):
+                    st.session_state["image_filter"] = "blur"
+            with filter_col2:
+                if st.button(t["btn_sharpen"], key="btn_sharpen_click", type="secondary"):
+                    st.session_state["image_filter"] = "sharpen"
+            with filter_col3:
+                if st.button(t["btn_background"], key="btn_bg_click", type="secondary"):
+                    st.session_state["image_filter"] = "background"
+
+            filter_col4, filter_col5, filter_col6 = st.columns(3)
+            with filter_col4:
+                if st.button(t["btn_grayscale"], key="btn_gray_click", type="secondary"):
+                    st.session_state["image_filter"] = "grayscale"
+            with filter_col5:
+                if st.button(t["btn_edge"], key="btn_edge_click", type="secondary"):
+                    st.session_state["image_filter"] = "edge"
+            with filter_col6:
+                if st.button(t["btn_brightness"], key="btn_bright_click", type="secondary"):
+                    st.session_state["image_filter"] = "brightness"
+
+            filter_col7, filter_col8, _ = st.columns(3)
+            with filter_col7:
+                if st.button(t["btn_morphology"], key="btn_morph_click", type="secondary"):
+                    st.session_state["image_filter"] = "morphology"
+            with filter_col8:
+                if st.button(t["btn_frequency"], key="btn_freq_click", type="secondary"):
+                    st.session_state["image_filter"] = "frequency"
+
+        with st.container(border=True):
+            if original_img is None:
+                st.info(t["filter_info"])
+            else:
+                fmode = st.session_state["image_filter"]
+
+                if fmode == "blur":
+                    st.markdown(t["blur_settings"])
+                    k = st.slider(t["blur_kernel"], 3, 31, 5, step=2, key="blur_k")
+                    blur_fn = restrict(lambda img, s: gaussian_blur(img, max(1, int(round(k * s)))), region, k // 2 + 1)
+                    if live_mode:
+                        live_preview_panel(t, "blur", (k, region_key), blur_fn, t["blur_result"])
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_blur"):
+                        key, out = cached_result("blur", lambda: blur_fn(original_img, 1.0), k=k, **roi_params)
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["blur_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="blur.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="blur.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "sharpen":
+                    st.markdown(t["sharpen_settings"])
+                    st.write(t["sharpen_desc"])
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_sharp"):
+                        sharpen_fn = restrict(lambda img, s: sharpen(img), region, 1)
+                        key, out = cached_result("sharpen", lambda: sharpen_fn(original_img, 1.0), **roi_params)
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["sharpen_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="sharpen.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="sharpen.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "grayscale":
+                    st.markdown(t["gray_settings"])
+                    st.write(t["gray_desc"])
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_gray"):
+                        gray_fn = restrict(lambda img, s: rgb_to_gray(img), region)
+                        key, gray = cached_result("grayscale", lambda: gray_fn(original_img, 1.0), **roi_params)
+                        png = cached_image_bytes(key, gray, "PNG")
+                        st.image(cached_display_bytes(key, gray), caption=t["gray_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="grayscale.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, gray, "JPEG"),
+                                file_name="grayscale.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "edge":
+                    st.markdown(t["edge_settings"])
+                    method = st.selectbox(
+                        t["edge_method"],
+                        ["Sobel", "Canny"],
+                        key="edge_method_sel",
+                    )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_edge"):
+                        edge_fn = restrict(lambda img, s: edge_detect(img, method), region, 2)
+                        key, out = cached_result(
+                            "edge", lambda: edge_fn(original_img, 1.0), method=method, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["edge_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="edge.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="edge.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "brightness":
+                    st.markdown(t["bright_settings"])
+                    method = st.selectbox(
+                        t["bright_method"],
+                        ["linear", "equalize", "clahe", "auto_levels"],
+                        format_func=lambda m: t[f"bright_method_{m}"],
+                        key="bright_method",
+                    )
+                    if method == "linear":
+                        b = st.slider(t["bright_brightness"], -100, 100, 0, key="bright_val")
+                        c = st.slider(t["bright_contrast"], -100, 100, 0, key="contrast_val")
+                        params = {"brightness": b, "contrast": c}
+                        enhance_fn = lambda img, s: adjust_brightness_contrast(img, brightness=b, contrast=c)
+                    elif method == "equalize":
+                        params = {}
+                        enhance_fn = lambda img, s: enhance.equalize(img)
+                    elif method == "clahe":
+                        clip = st.slider(t["clahe_clip"], 0.5, 8.0, 2.0, step=0.5, key="clahe_clip")
+                        tiles = st.slider(t["clahe_tiles"], 2, 16, 8, key="clahe_tiles")
+                        params = {"clip": clip, "tiles": tiles}
+                        enhance_fn = lambda img, s: enhance.clahe(img, clip_limit=clip, tiles=(tiles, tiles))
+                    else:
+                        pct = st.slider(t["levels_pct"], 0.0, 100.0, (1.0, 99.0), step=0.5, key="levels_pct")
+                        params = {"low_pct": pct[0], "high_pct": pct[1]}
+                        enhance_fn = lambda img, s: enhance.auto_levels(img, pct[0], pct[1])
+                    # Histogram-based methods take their statistics from the region.
+                    enhance_fn = restrict(enhance_fn, region)
+                    if live_mode:
+                        live_preview_panel(
+                            t, "brightness", (method, tuple(sorted(params.items())), region_key),
+                            enhance_fn,
+                            t["bright_result"],
+                        )
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_bright"):
+                        key, out = cached_result(
+                            "brightness", lambda: enhance_fn(original_img, 1.0), method=method, **params, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["bright_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="brightness_contrast.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="brightness_contrast.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "background":
+                    st.markdown(t["bg_settings"])
+                    st.write(t["bg_method"])
+                    bg_h = st.slider(t["bg_hue"], 0, 180, (BG_HSV_LOWER[0], BG_HSV_UPPER[0]), key="bg_h")
+                    bg_s = st.slider(t["bg_sat"], 0, 255, (BG_HSV_LOWER[1], BG_HSV_UPPER[1]), key="bg_s")
+                    bg_v = st.slider(t["bg_val"], 0, 255, (BG_HSV_LOWER[2], BG_HSV_UPPER[2]), key="bg_v")
+                    cleanup = st.selectbox(t["bg_cleanup"], list(masks.CLEANUPS), key="bg_cleanup")
+                    radius = st.slider(t["bg_radius"], 1, 50, 2, key="bg_radius")
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_bg"):
+                        lower = (bg_h[0], bg_s[0], bg_v[0])
+                        upper = (bg_h[1], bg_s[1], bg_v[1])
+                        key, out = cached_result(
+                            "background",
+                            lambda: simple_background_removal_hsv(
+                                original_img, lower, upper, cleanup=cleanup, radius=radius,
+                            )[0],
+                            lower=lower, upper=upper, cleanup=cleanup, radius=radius,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        st.image(cached_display_bytes(key, out), caption=t["bg_result"], use_column_width=True)
+                        h, w = out.shape[:2]
+                        st.caption(t["bg_mask_size"].format(
+                            packed=masks.PackedMask.nbytes_for((h, w)) / 1024, full=h * w / 1024,
+                        ))
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="background_removed.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="background_removed.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "morphology":
+                    st.markdown(t["morph_settings"])
+                    morph_op = st.selectbox(
+                        t["morph_op"],
+                        list(morphology.OPS),
+                        format_func=lambda op: t[f"morph_op_{op}"],
+                        key="morph_op",
+                    )
+                    morph_radius = st.slider(t["morph_radius"], 1, 200, 3, key="morph_radius")
+                    target = st.radio(
+                        t["morph_target"],
+                        ["image", "mask"],
+                        format_func=lambda x: t[f"morph_target_{x}"],
+                        horizontal=True,
+                        key="morph_target",
+                    )
+                    if (morph_op == "median" and target == "image" and depth.format_of(original_img) != "uint8"
+                            and morph_radius > morphology.HIGH_DEPTH_MEDIAN_MAX_RADIUS):
+                        morph_radius = morphology.HIGH_DEPTH_MEDIAN_MAX_RADIUS
+                        st.caption(t["morph_median_depth"].format(radius=morph_radius))
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_morph"):
+                        if target == "mask":
+                            # Same HSV range as the background tool.
+                            lower, upper = background_settings()[:2]
+                            key, out = cached_result(
+                                "mask_morphology",
+                                lambda: mask_morphology(original_img, morph_op, morph_radius, lower, upper)[0],
+                                method=morph_op, radius=morph_radius, lower=lower, upper=upper,
+                            )
+                        else:
+                            morph_fn = restrict(
+                                lambda img, s: morphology_filter(img, morph_op, morph_radius),
+                                region, morphology.halo(morph_op, morph_radius),
+                            )
+                            key, out = cached_result(
+                                "morphology", lambda: morph_fn(original_img, 1.0),
+                                method=morph_op, radius=morph_radius, **roi_params,
+                            )
+                        png = cached_image_bytes(key, out, "PNG")
+                        if target == "mask":
+                            c_img, c_mask = st.columns(2)
+                            with c_img:
+                                st.image(cached_display_bytes(key, out), caption=t["morph_result"], use_column_width=True)
+                            with c_mask:
+                                st.image(depth.quantize(out[:, :, 3]), caption=t["morph_mask"], use_column_width=True)
+                        else:
+                            st.image(cached_display_bytes(key, out), caption=t["morph_result"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="morphology.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="morphology.jpg",
+                                mime="image/jpeg",
+                            )
+
+                elif fmode == "frequency":
+                    st.markdown(t["freq_settings"])
+                    st.write(t["freq_desc"])
+                    freq_mode = st.selectbox(
+                        t["freq_mode"],
+                        ["lowpass", "highpass", "bandpass", "blur", "deconvolve"],
+                        format_func=lambda m: t[f"freq_mode_{m}"],
+                        key="freq_mode",
+                    )
+                    if freq_mode in ("lowpass", "highpass", "bandpass"):
+                        shape = st.selectbox(t["freq_shape"], list(frequency.SHAPES), index=2, key="freq_shape")
+                        if freq_mode == "bandpass":
+                            low, high = st.slider(t["freq_band"], 0.01, 1.0, (0.05, 0.3), 0.01, key="freq_band")
+                            params = {"low": low, "high": high}
+                        else:
+                            params = {"cutoff": st.slider(t["freq_cutoff"], 0.01, 1.0, 0.15, 0.01, key="freq_cutoff")}
+                        if shape == "butterworth":
+                            params["order"] = st.slider(t["freq_order"], 1, 8, 2, key="freq_order")
+                        params["shape"] = shape
+                        compute = partial(frequency.pass_filter, kind=freq_mode, **params)
+                        halo = frequency.pass_halo(freq_mode, **params)
+                        if live_mode:
+                            live_preview_panel(
+                                t, f"freq_{freq_mode}", (tuple(sorted(params.items())), region_key),
+                                restrict(lambda img, s: compute(img), region, halo), t["freq_result"],
+                            )
+                    elif freq_mode == "blur":
+                        disk = st.slider(t["freq_disk"], 1, 150, 25, key="freq_disk")
+                        params = {"radius": disk}
+                        compute = partial(frequency.filter2d, kernel=frequency.disk_kernel(disk))
+                        halo = disk
+                    else:
+                        psf_kind = st.radio(
+                            t["freq_psf"], ["gaussian", "motion"],
+                            format_func=lambda x: t[f"freq_psf_{x}"], horizontal=True, key="freq_psf",
+                        )
+                        if psf_kind == "gaussian":
+                            sigma = st.slider(t["freq_sigma"], 0.5, 10.0, 2.0, 0.5, key="freq_sigma")
+                            psf = frequency.gaussian_psf(sigma)
+                            params = {"psf": psf_kind, "sigma": sigma}
+                        else:
+                            length = st.slider(t["freq_length"], 3, 61, 15, key="freq_length")
+                            angle = st.slider(t["freq_angle"], -90, 90, 0, key="freq_angle")
+                            psf = frequency.motion_psf(length, angle)
+                            params = {"psf": psf_kind, "length": length, "angle": angle}
+                        nsr = st.select_slider(
+                            t["freq_nsr"], [0.0001, 0.0003, 0.001, 0.003, 0.01, 0.03, 0.1], 0.003, key="freq_nsr",
+                        )
+                        params["nsr"] = nsr
+                        compute = partial(frequency.wiener_deconvolve, psf=psf, nsr=nsr)
+                        halo = max(psf.shape)
+
+                    if st.button(f"{t['btn_apply']} ✅", key="apply_freq"):
+                        # Spectra are cached per image, and a region filter sees a different
+                        # image: the region grown by this filter's halo, which follows the params.
+                        spec_key = original_hash()
+                        if region is not None:
+                            spec_key += ":" + region.patch_key(int(math.ceil(halo)))
+                        freq_fn = restrict(lambda img, s: compute(img, key=spec_key), region, halo)
+                        key, out = cached_result(
+                            f"frequency_{freq_mode}", lambda: freq_fn(original_img, 1.0), **params, **roi_params,
+                        )
+                        png = cached_image_bytes(key, out, "PNG")
+                        c_img, c_spec = st.columns(2)
+                        with c_img:
+                            st.image(cached_display_bytes(key, out), caption=t["freq_result"], use_column_width=True)
+                        with c_spec:
+                            st.image(frequency.log_magnitude(out), caption=t["freq_spectrum"], use_column_width=True)
+                        c_png, c_jpg = st.columns(2)
+                        with c_png:
+                            st.download_button(
+                                "⬇️ Download PNG",
+                                data=png,
+                                file_name="frequency.png",
+                                mime="image/png",
+                            )
+                        with c_jpg:
+                            st.download_button(
+                                "⬇️ Download JPG",
+                                data=cached_image_bytes(key, out, "JPEG"),
+                                file_name="frequency.jpg",
+                                mime="image/jpeg",
+                            )
+
+    # Workflow: chained ops with per-step caching
+    with st.container(border=True):
+        st.markdown(t["wf_title"])
+        st.write(t["wf_desc"])
+        if original_img is None:
+            st.info(t["filter_info"])
+        else:
+            steps = st.multiselect(
+                t["wf_steps"],
+                list(WORKFLOW_STEPS),
+                format_func=lambda op: t[WORKFLOW_STEPS[op][0]],
+                key="wf_steps",
+            )
+            chain = []
+            for i, op in enumerate(steps):
+                label_key, sliders = WORKFLOW_STEPS[op]
+                params = {}
+                if sliders:
+                    st.markdown(f"**{i + 1}. {t[label_key]}**")
+                    cols = st.columns(len(sliders))
+                    for col, (name, lo, hi, default, step) in zip(cols, sliders):
+                        with col:
+                            params[name] = st.slider(name, lo, hi, default, step, key=f"wf_{op}_{name}")
+                chain.append((f"{i + 1}:{op}", op, params))
+
+            if chain:
+                graph = get_op_graph()
+                last = graph.set_chain("original", chain)
+                # The node key covers the source and every step, so the encoded
+                # result is reused across reruns like the node output itself.
+                key = graph.key(last)
+                out = graph.evaluate(last)
+                png = cached_image_bytes(key, out, "PNG")
+                st.image(cached_display_bytes(key, out), caption=t["wf_result"], use_column_width=True)
+                st.download_button(
+                    "⬇️ Download PNG",
+                    data=png,
+                    file_name="workflow.png",
+                    mime="image/png",
+                )
+                st.markdown(t["wf_stats"])
+                st.table(graph.stats())
+                st.caption(t["wf_cache"].format(mb=graph.cache_bytes() / 2**20))
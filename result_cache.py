@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import cache_util
+
+# ===================== PERSISTENT RESULT CACHE =====================
+#
+# Processed arrays are stored as .npy files (loaded back memory-mapped) and
+# encoded downloads as .png/.jpg files. An sqlite index next to the files
+# records size and last access so every worker process on the host shares one
+# LRU with one size cap. Files are written to a temp name and os.replace()d
+# into place, so readers never see a partial entry.
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "RESULT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results"),
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# Part of every key. Entries outlive the code that wrote them (the cache is on
+# disk and shared by every process), so bump this whenever an op's output
+# changes for the same source and parameters.
+CACHE_VERSION = 2
+
+_EXTENSIONS = {"NPY": ".npy", "PNG": ".png", "JPEG": ".jpg", "JPG": ".jpg"}
+
+
+def content_hash(arr):
+    """Stable digest of an array's shape, dtype and pixel data."""
+    arr = np.ascontiguousarray(arr)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(arr.shape).encode())
+    h.update(arr.dtype.str.encode())
+    h.update(memoryview(arr).cast("B"))
+    return h.hexdigest()
+
+
+def make_key(source_hash, op, **params):
+    payload = json.dumps([CACHE_VERSION, source_hash, op, params], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " name TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_access ON entries(last_access)")
+
+    # ---------- index ----------
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _path(self, name):
+        return os.path.join(self.directory, name[:2], name)
+
+    def _touch(self, name):
+        with self._conn() as conn:
+            conn.execute("UPDATE entries SET last_access=? WHERE name=?", (time.time(), name))
+
+    def _forget(self, name):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM entries WHERE name=?", (name,))
+
+    def _record(self, name, size):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries(name, size, last_access) VALUES (?, ?, ?)",
+                (name, size, time.time()),
+            )
+        self._evict()
+
+    def _evict(self):
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT name, size FROM entries ORDER BY last_access").fetchall()
+        for name, size in rows:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+            self._forget(name)
+            total -= size
+
+    def _write_atomic(self, name, write):
+        path = self._path(name)
+        cache_util.write_atomic(path, write)
+        self._record(name, os.path.getsize(path))
+
+    # ---------- arrays ----------
+
+    def get_array(self, key):
+        name = key + _EXTENSIONS["NPY"]
+        try:
+            arr = np.load(self._path(name), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            self._forget(name)
+            return None
+        self._touch(name)
+        return arr
+
+    def put_array(self, key, arr):
+        arr = np.ascontiguousarray(arr)
+        self._write_atomic(key + _EXTENSIONS["NPY"], lambda f: np.save(f, arr, allow_pickle=False))
+
+    def get_or_compute(self, key, compute):
+        arr = self.get_array(key)
+        if arr is None:
+            arr = compute()
+            self.put_array(key, arr)
+        return arr
+
+    # ---------- encoded bytes ----------
+
+    def get_bytes(self, key, fmt):
+        name = key + _EXTENSIONS[fmt.upper()]
+        try:
+            with open(self._path(name), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._forget(name)
+            return None
+        self._touch(name)
+        return data
+
+    def put_bytes(self, key, fmt, data):
+        self._write_atomic(key + _EXTENSIONS[fmt.upper()], lambda f: f.write(data))
+
+    def get_or_encode(self, key, fmt, encode):
+        data = self.get_bytes(key, fmt)
+        if data is None:
+            data = encode()
+            self.put_bytes(key, fmt, data)
+        return data
+
+    def stats(self):
+        entries, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {"entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
@@ -0,0 +1,145 @@
+import numpy as np
+import cv2
+
+import masks
+import result_cache
+from ops import apply_affine_transform
+
+# ===================== REGIONS OF INTEREST =====================
+#
+# A Region is a rectangle of the frame, optionally narrowed by a packed mask
+# cropped to that rectangle. Filters run on the rectangle grown by the
+# filter's halo (the context its kernel reads), which is a view into the
+# frame, so no full-size copy is made on the way in; only the rectangle of
+# the result is kept and pasted into a copy of the frame, through the mask
+# if there is one. Transforms never read a crop: only the output pixels of
+# the rectangle are computed, sampling the whole frame. Either way the work
+# and the temporaries scale with the region, and only the final composite
+# is frame-sized.
+
+
+class Region:
+    def __init__(self, x, y, w, h, frame, mask=None):
+        self.x, self.y, self.w, self.h = int(x), int(y), int(w), int(h)
+        self.frame = tuple(frame[:2])
+        self.mask = mask
+
+    @classmethod
+    def rect(cls, x, y, w, h, frame):
+        """Rectangle clipped to the frame; None if nothing is left."""
+        fh, fw = frame[:2]
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(fw, int(x + w)), min(fh, int(y + h))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return cls(x0, y0, x1 - x0, y1 - y0, frame)
+
+    @classmethod
+    def from_fractions(cls, xs, ys, frame):
+        """Rectangle from (start, end) fractions of the frame width and height."""
+        fh, fw = frame[:2]
+        x0, x1 = int(round(xs[0] * fw)), int(round(xs[1] * fw))
+        y0, y1 = int(round(ys[0] * fh)), int(round(ys[1] * fh))
+        return cls.rect(x0, y0, x1 - x0, y1 - y0, frame)
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Bounding box of a PackedMask, keeping the mask inside it."""
+        bits = mask.bits
+        rows = np.flatnonzero(bits.any(axis=1))
+        if rows.size == 0:
+            return None
+        y0, y1 = rows[0], rows[-1] + 1
+        # OR the packed rows together to find the occupied columns.
+        occupied = np.unpackbits(np.bitwise_or.reduce(bits[y0:y1], axis=0), count=mask.shape[1])
+        cols = np.flatnonzero(occupied)
+        x0, x1 = cols[0], cols[-1] + 1
+        inside = mask.to_bool(slice(y0, y1))[:, x0:x1]
+        return cls(x0, y0, x1 - x0, y1 - y0, mask.shape, masks.PackedMask.from_bool(inside))
+
+    @property
+    def area(self):
+        return self.w * self.h if self.mask is None else self.mask.count()
+
+    @property
+    def fraction(self):
+        return self.area / float(self.frame[0] * self.frame[1])
+
+    def key(self):
+        """Short string identifying the region, for cache keys."""
+        key = f"{self.frame[1]}x{self.frame[0]}:{self.x},{self.y},{self.w},{self.h}"
+        if self.mask is not None:
+            key += ":" + result_cache.content_hash(self.mask.bits)[:12]
+        return key
+
+    def patch_key(self, halo=0):
+        """Like key(), for the patch apply() hands to a filter with this halo."""
+        y0, y1, x0, x1 = self.bounds(halo)
+        return f"{self.frame[1]}x{self.frame[0]}:{x0},{y0},{x1 - x0},{y1 - y0}"
+
+    def bounds(self, halo=0):
+        """(y0, y1, x0, x1) of the region grown by halo, clipped to the frame."""
+        fh, fw = self.frame
+        return (
+            max(0, self.y - halo), min(fh, self.y + self.h + halo),
+            max(0, self.x - halo), min(fw, self.x + self.w + halo),
+        )
+
+    def scaled(self, frame):
+        """The same region on a resized copy of the frame (e.g. a preview proxy)."""
+        fh, fw = frame[:2]
+        sy, sx = fh / float(self.frame[0]), fw / float(self.frame[1])
+        x0, y0 = int(self.x * sx), int(self.y * sy)
+        x1 = max(x0 + 1, min(fw, int(round((self.x + self.w) * sx))))
+        y1 = max(y0 + 1, min(fh, int(round((self.y + self.h) * sy))))
+        mask = self.mask
+        if mask is not None:
+            mask = masks.PackedMask.from_bool(cv2.resize(
+                mask.to_uint8(), (x1 - x0, y1 - y0), interpolation=cv2.INTER_NEAREST,
+            ))
+        return Region(x0, y0, x1 - x0, y1 - y0, frame, mask)
+
+
+def composite(img, inner, region):
+    """Copy of img with inner (region-sized) pasted over the region."""
+    if inner.ndim == 3 and img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+    else:
+        img = img.copy()
+    if inner.ndim == 2 and img.ndim == 3:
+        code = cv2.COLOR_GRAY2RGBA if img.shape[2] == 4 else cv2.COLOR_GRAY2RGB
+        inner = cv2.cvtColor(inner, code)
+    dst = img[region.y:region.y + region.h, region.x:region.x + region.w]
+    if region.mask is None:
+        dst[...] = inner
+    else:
+        where = region.mask.to_bool()
+        np.copyto(dst, inner, where=where if dst.ndim == 2 else where[:, :, None])
+    return img
+
+
+def apply(img, fn, region, halo=0):
+    """
+    fn(img) restricted to region: fn sees the region plus halo pixels of
+    context on each side and must return an image of the same size.
+    """
+    if region is None:
+        return fn(img)
+    y0, y1, x0, x1 = region.bounds(halo)
+    patch = fn(img[y0:y1, x0:x1])
+    oy, ox = region.y - y0, region.x - x0
+    return composite(img, patch[oy:oy + region.h, ox:ox + region.w], region)
+
+
+def warp(img, M, region):
+    """apply_affine_transform(img, M) computed for the pixels of region only."""
+    if region is None:
+        return apply_affine_transform(img, M)
+    M = np.asarray(M, dtype=np.float64)
+    if M.shape == (2, 3):
+        M = np.vstack([M, [0.0, 0.0, 1.0]])
+    # Output pixel (u, v) of the region is output pixel (u + x, v + y) of
+    # the frame, which M maps from.
+    shift = np.array([[1, 0, -region.x], [0, 1, -region.y], [0, 0, 1]], dtype=np.float64)
+    inner = apply_affine_transform(img, shift @ M, output_size=(region.w, region.h))
+    return composite(img, inner, region)
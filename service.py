@@ -0,0 +1,447 @@
+"""
+Headless HTTP service for the image operations in ops.py.
+
+    python service.py --port 8502
+
+POST the raw PNG/JPEG/TIFF bytes to /v1/<op>?<params> and the response body is
+the processed image (PNG by default, ?format=jpeg or ?format=tiff otherwise).
+?depth=uint16 or ?depth=float32 runs the op in that working format and
+?depth=source keeps the upload's own depth; PNG and TIFF responses are then
+16-bit. /v1/histogram answers with JSON per-channel counts. GET /healthz and
+GET /stats are for probes.
+
+    curl --data-binary @photo.jpg "http://127.0.0.1:8502/v1/rotate?angle=30" -o out.png
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import depth
+import enhance
+import frequency
+import image_io
+import masks
+import morphology
+import ops
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024 * 1024
+# No parameter is meaningful beyond this magnitude, and reflected borders
+# make warps slower the further out they sample (seconds at 1e6 px).
+MAX_PARAM_MAGNITUDE = 1e4
+KEEPALIVE_TIMEOUT = 15.0
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class BadRequest(Exception):
+    pass
+
+
+# ===================== OPERATIONS =====================
+
+def _num(params, name, default, cast=float, low=-MAX_PARAM_MAGNITUDE, high=MAX_PARAM_MAGNITUDE):
+    try:
+        value = cast(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"parameter {name!r} must be a number") from None
+    if not math.isfinite(value) or not low <= value <= high:
+        raise BadRequest(f"parameter {name!r} must be in [{low:g}, {high:g}]")
+    return value
+
+
+def _triple(params, name, default):
+    raw = params.get(name)
+    if raw is None:
+        return default
+    try:
+        values = tuple(int(v) for v in raw.split(","))
+    except ValueError:
+        raise BadRequest(f"parameter {name!r} must be three comma-separated integers") from None
+    if len(values) != 3:
+        raise BadRequest(f"parameter {name!r} must be three comma-separated integers")
+    if not all(0 <= v <= 255 for v in values):
+        raise BadRequest(f"parameter {name!r} values must be in 0..255")
+    return values
+
+
+def _op_scale(img, p):
+    sx, sy = _num(p, "sx", 1.0), _num(p, "sy", 1.0)
+    if not (0 < sx <= 10 and 0 < sy <= 10):
+        raise BadRequest("scale factors must be in (0, 10]")
+    h, w = img.shape[:2]
+    return ops.apply_affine_transform(
+        img, ops.scaling_matrix(sx, sy), output_size=(max(1, int(w * sx)), max(1, int(h * sy))),
+    )
+
+
+def _op_blur(img, p):
+    k = _num(p, "k", 5, int)
+    if not 1 <= k <= 99:
+        raise BadRequest("k must be in [1, 99]")
+    return ops.gaussian_blur(img, k)
+
+
+def _op_background(img, p):
+    cleanup = p.get("cleanup", "none")
+    if cleanup not in masks.CLEANUPS:
+        raise BadRequest(f"cleanup must be one of {sorted(masks.CLEANUPS)}")
+    rgba, _ = ops.simple_background_removal_hsv(
+        img,
+        _triple(p, "lower", ops.BG_HSV_LOWER),
+        _triple(p, "upper", ops.BG_HSV_UPPER),
+        cleanup=cleanup,
+        radius=_num(p, "radius", 1, int, 0, 500),
+    )
+    return rgba
+
+
+def _op_morphology(img, p):
+    op = p.get("op", "opening")
+    if op not in morphology.OPS:
+        raise BadRequest(f"op must be one of {sorted(morphology.OPS)}")
+    radius = _num(p, "radius", 1, int)
+    if not 0 <= radius <= 500:
+        raise BadRequest("radius must be in 0..500")
+    if (op == "median" and depth.format_of(img) != "uint8" and p.get("target", "image") != "mask"
+            and radius > morphology.HIGH_DEPTH_MEDIAN_MAX_RADIUS):
+        raise BadRequest(f"median radius must be at most {morphology.HIGH_DEPTH_MEDIAN_MAX_RADIUS} "
+                         "for 16-bit and float images")
+    if p.get("target", "image") == "mask":
+        rgba, _ = ops.mask_morphology(
+            img, op, radius,
+            _triple(p, "lower", ops.BG_HSV_LOWER),
+            _triple(p, "upper", ops.BG_HSV_UPPER),
+        )
+        return rgba
+    return ops.morphology_filter(img, op, radius)
+
+
+def _op_frequency(img, p):
+    mode = p.get("mode", "lowpass")
+    if mode in ("lowpass", "highpass", "bandpass"):
+        shape = p.get("shape", "butterworth")
+        if shape not in frequency.SHAPES:
+            raise BadRequest(f"shape must be one of {list(frequency.SHAPES)}")
+        return frequency.pass_filter(
+            img, mode,
+            cutoff=_num(p, "cutoff", 0.15, float, 0, 2), low=_num(p, "low", 0.05, float, 0, 2),
+            high=_num(p, "high", 0.3, float, 0, 2), shape=shape, order=_num(p, "order", 2, int, 1, 16),
+        )
+    if mode == "blur":
+        radius = _num(p, "radius", 25, int)
+        if not 1 <= radius <= 500:
+            raise BadRequest("radius must be in 1..500")
+        return frequency.filter2d(img, frequency.disk_kernel(radius))
+    if mode == "deconvolve":
+        if p.get("psf", "gaussian") == "motion":
+            psf = frequency.motion_psf(_num(p, "length", 15, int, 1, 501), _num(p, "angle", 0.0))
+        else:
+            # gaussian_psf spans 6 sigma, so this matches the other 500 px limits.
+            psf = frequency.gaussian_psf(_num(p, "sigma", 2.0, float, 0.1, 80))
+        return frequency.wiener_deconvolve(img, psf, _num(p, "nsr", 0.003, float, 1e-6, 10))
+    raise BadRequest("mode must be lowpass, highpass, bandpass, blur or deconvolve")
+
+
+def _op_edge(img, p):
+    method = p.get("method", "sobel").capitalize()
+    if method not in ("Sobel", "Canny"):
+        raise BadRequest("method must be sobel or canny")
+    return ops.edge_detect(img, method)
+
+
+def _op_clahe(img, p):
+    tiles = _num(p, "tiles", 8, int)
+    if not 1 <= tiles <= 64:
+        raise BadRequest("tiles must be in [1, 64]")
+    return enhance.clahe(img, clip_limit=_num(p, "clip", 2.0, float, 0, 256), tiles=(tiles, tiles))
+
+
+def _op_histogram(img, p):
+    return {col: hist.astype(int).tolist() for col, hist in ops.histogram_data(img).items()}
+
+
+OPS = {
+    "translate": lambda img, p: ops.apply_affine_transform(
+        img, ops.translation_matrix(_num(p, "dx", 0), _num(p, "dy", 0)),
+    ),
+    "scale": _op_scale,
+    "rotate": lambda img, p: ops.apply_affine_transform(
+        img, ops.rotation_matrix(_num(p, "angle", 0), img.shape[1], img.shape[0]),
+    ),
+    "shear": lambda img, p: ops.apply_affine_transform(
+        img, ops.shear_matrix(_num(p, "shx", 0), _num(p, "shy", 0)),
+    ),
+    "reflect": lambda img, p: ops.apply_affine_transform(
+        img, ops.reflection_matrix(p.get("axis", "x"), img.shape[1], img.shape[0]),
+    ),
+    "perspective": lambda img, p: ops.apply_affine_transform(
+        img, ops.perspective_matrix(_num(p, "px", 0), _num(p, "py", 0), img.shape[1], img.shape[0]),
+    ),
+    "blur": _op_blur,
+    "sharpen": lambda img, p: ops.sharpen(img),
+    "grayscale": lambda img, p: ops.rgb_to_gray(img),
+    "edge": _op_edge,
+    "brightness": lambda img, p: ops.adjust_brightness_contrast(
+        img, brightness=_num(p, "brightness", 0), contrast=_num(p, "contrast", 0),
+    ),
+    "equalize": lambda img, p: enhance.equalize(img),
+    "clahe": _op_clahe,
+    "autolevels": lambda img, p: enhance.auto_levels(
+        img, _num(p, "low", 1.0, float, 0, 100), _num(p, "high", 99.0, float, 0, 100),
+    ),
+    "background": _op_background,
+    "morphology": _op_morphology,
+    "frequency": _op_frequency,
+    "histogram": _op_histogram,
+}
+
+
+def run_one(op, params, body):
+    """Decode, apply and encode one request; returns (status, content_type, bytes)."""
+    work = params.get("depth", "uint8")
+    if work != "source" and work not in depth.FORMATS:
+        return 400, "application/json", _error(f"depth must be source or one of {', '.join(depth.FORMATS)}")
+    try:
+        img = image_io.load_image(body, keep_depth=work != "uint8")
+    except Exception:
+        img = None
+    if img is None:
+        return 400, "application/json", _error("body is not a decodable image")
+    if work != "source":
+        img = depth.to_format(img, work)
+    try:
+        out = OPS[op](img, params)
+    except BadRequest as exc:
+        return 400, "application/json", _error(str(exc))
+    if isinstance(out, dict):
+        return 200, "application/json", json.dumps(out).encode()
+    fmt = params.get("format", "png").upper()
+    fmt = {"JPG": "JPEG", "JPEG": "JPEG", "TIF": "TIFF", "TIFF": "TIFF"}.get(fmt, "PNG")
+    return 200, f"image/{fmt.lower()}", image_io.image_to_bytes(out, fmt)
+
+
+def run_chunk(op, params, bodies):
+    # One failing body must not take the rest of the batch down with it.
+    results = []
+    for body in bodies:
+        try:
+            results.append(run_one(op, params, body))
+        except Exception as exc:
+            results.append((500, "application/json", _error(f"{type(exc).__name__}: {exc}")))
+    return results
+
+
+def _error(message):
+    return json.dumps({"error": message}).encode()
+
+
+# ===================== MICRO-BATCHING =====================
+
+class MicroBatcher:
+    """
+    Requests for the same op and parameters that arrive within `window`
+    seconds are collected into one batch. Identical bodies in a batch are
+    computed once, and the distinct ones are split into at most `workers`
+    chunks, so a burst costs a handful of executor hand-offs instead of one
+    per request while every worker stays busy.
+    """
+
+    def __init__(self, executor, workers, window=0.002, max_batch=32, max_pending=256):
+        self.executor = executor
+        self.workers = workers
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.pending = 0
+        self._open = {}
+        self.stats = {"requests": 0, "batches": 0, "coalesced": 0, "rejected": 0}
+
+    def submit(self, op, params, body):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            fut.set_result((503, "application/json", _error("server busy, retry later")))
+            return fut
+        self.pending += 1
+        self.stats["requests"] += 1
+
+        key = (op, tuple(sorted(params.items())))
+        batch = self._open.get(key)
+        if batch is None:
+            batch = self._open[key] = []
+            loop.call_later(self.window, self._flush, key, batch)
+        batch.append((body, fut))
+        if len(batch) >= self.max_batch:
+            self._flush(key, batch)
+        return fut
+
+    def _flush(self, key, batch):
+        if self._open.get(key) is not batch:
+            return
+        del self._open[key]
+        self.stats["batches"] += 1
+        op, params = key[0], dict(key[1])
+
+        unique = {}
+        for body, fut in batch:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            unique.setdefault(digest, (body, []))[1].append(fut)
+        self.stats["coalesced"] += len(batch) - len(unique)
+
+        groups = list(unique.values())
+        per_chunk = -(-len(groups) // self.workers)
+        for start in range(0, len(groups), per_chunk):
+            chunk = groups[start:start + per_chunk]
+            task = asyncio.get_running_loop().run_in_executor(
+                self.executor, run_chunk, op, params, [body for body, _ in chunk],
+            )
+            task.add_done_callback(lambda t, chunk=chunk: self._resolve(t, chunk))
+
+    def _resolve(self, task, chunk):
+        exc = task.exception()
+        results = [None] * len(chunk) if exc else task.result()
+        for (_, futs), result in zip(chunk, results):
+            if result is None:
+                result = (500, "application/json", _error(f"{type(exc).__name__}: {exc}"))
+            for fut in futs:
+                self.pending -= 1
+                if not fut.done():
+                    fut.set_result(result)
+
+
+# ===================== HTTP/1.1 =====================
+
+class Server:
+    def __init__(self, workers, window, max_batch, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="op")
+        self.batcher = MicroBatcher(self.executor, workers, window, max_batch, max_pending)
+        self.started = time.time()
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT,
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, "application/json", _error("headers too large"), False)
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, "application/json", _error("bad request line"), False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                body = b""
+                if "transfer-encoding" in headers:
+                    await self._respond(writer, 411, "application/json", _error("send Content-Length"), False)
+                    return
+                raw_length = headers.get("content-length", "0") or "0"
+                if not (raw_length.isascii() and raw_length.isdigit()):
+                    await self._respond(writer, 400, "application/json", _error("bad Content-Length"), False)
+                    return
+                length = int(raw_length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, "application/json", _error("image too large"), False)
+                    return
+                if length:
+                    try:
+                        body = await reader.readexactly(length)
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        return
+
+                status, ctype, payload = await self.route(method, target, body)
+                await self._respond(writer, status, ctype, payload, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            return 200, "text/plain", b"ok"
+        if url.path == "/stats":
+            stats = dict(self.batcher.stats, pending=self.batcher.pending,
+                         connections=self.connections, uptime_s=round(time.time() - self.started, 1))
+            return 200, "application/json", json.dumps(stats).encode()
+        if not url.path.startswith("/v1/"):
+            return 404, "application/json", _error("not found")
+        op = url.path[len("/v1/"):]
+        if op not in OPS:
+            return 404, "application/json", _error(f"unknown op {op!r}; try one of {sorted(OPS)}")
+        if method != "POST":
+            return 405, "application/json", _error("POST the image bytes")
+        if not body:
+            return 400, "application/json", _error("empty body")
+        return await self.batcher.submit(op, dict(parse_qsl(url.query)), body)
+
+    async def _respond(self, writer, status, ctype, payload, keep_alive):
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        writer.write(payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(host, port, workers, window, max_batch, max_pending):
+    server = Server(workers, window, max_batch, max_pending)
+    tcp = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES)
+    print(f"serving on http://{host}:{port} with {workers} workers", flush=True)
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-pending", type=int, default=256)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers,
+                          args.batch_window_ms / 1000.0, args.max_batch, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
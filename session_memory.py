@@ -0,0 +1,358 @@
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+import cv2
+
+import cache_util
+
+# ===================== SESSION MEMORY =====================
+#
+# Every Streamlit session keeps its uploaded image (and derived arrays) alive
+# for as long as the tab is open. This store holds those arrays for all
+# sessions of the process under one global byte budget:
+#   * "resident" entries are plain arrays and count fully against the budget;
+#   * entries of sessions idle for IDLE_SECONDS, or the least recently used
+#     ones when over budget, are compressed in memory (lossless PNG for 8- and
+#     16-bit images, zlib otherwise);
+#   * if compressed entries still exceed the budget they are spilled to disk.
+# get() rehydrates transparently, so callers only ever see arrays. Sessions
+# can also register droppable caches (size and release callbacks); those are
+# released before any array is compressed. Sessions unseen for TTL_SECONDS
+# are dropped entirely.
+#
+# stats() returns the gauges; they are also written in Prometheus text format
+# to METRICS_FILE (node-exporter textfile collector) at most every
+# METRICS_INTERVAL seconds, for sizing pods.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET_BYTES = int(os.environ.get("SESSION_MEMORY_MAX_MB", "1024")) * 1024 * 1024
+DEFAULT_SPILL_DIR = os.environ.get("SESSION_SPILL_DIR", os.path.join(ROOT, ".cache", "sessions"))
+IDLE_SECONDS = float(os.environ.get("SESSION_IDLE_SECONDS", "120"))
+TTL_SECONDS = float(os.environ.get("SESSION_TTL_SECONDS", "3600"))
+METRICS_FILE = os.environ.get("SESSION_METRICS_FILE", os.path.join(ROOT, ".cache", "metrics", "session_memory.prom"))
+METRICS_INTERVAL = 10.0
+
+RESIDENT, COMPRESSED, SPILLED = "resident", "compressed", "spilled"
+
+
+# ===================== CODEC =====================
+
+def _is_png_image(arr):
+    return arr.dtype in (np.uint8, np.uint16) and (arr.ndim == 2 or (arr.ndim == 3 and arr.shape[2] in (1, 3, 4)))
+
+
+def compress(arr):
+    """Lossless in-memory encoding of arr; returns (codec, payload bytes)."""
+    if _is_png_image(arr):
+        # Channel order is irrelevant here: decode undoes exactly what encode did.
+        ok, buf = cv2.imencode(".png", arr, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if ok:
+            return "png", buf.tobytes()
+    return "zlib", zlib.compress(np.ascontiguousarray(arr).tobytes(), 1)
+
+
+def decompress(codec, payload, shape, dtype):
+    if codec == "png":
+        arr = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        return arr.reshape(shape)
+    return np.frombuffer(zlib.decompress(payload), dtype=dtype).reshape(shape).copy()
+
+
+# ===================== STORE =====================
+
+class _Entry:
+    __slots__ = ("tier", "arr", "codec", "payload", "path", "shape", "dtype", "last_access")
+
+    def __init__(self, arr):
+        self.tier = RESIDENT
+        self.arr = arr
+        self.codec = self.payload = self.path = None
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+        self.last_access = time.monotonic()
+
+    def nbytes(self):
+        """Bytes this entry currently holds in RAM."""
+        if self.tier == RESIDENT:
+            return self.arr.nbytes
+        if self.tier == COMPRESSED:
+            return len(self.payload)
+        return 0
+
+
+class _Session:
+    def __init__(self):
+        self.entries = {}
+        self.caches = {}
+        self.last_seen = time.monotonic()
+
+    def cache_bytes(self):
+        total = 0
+        for size, _ in self.caches.values():
+            try:
+                total += int(size())
+            except Exception:
+                pass
+        return total
+
+
+class SessionMemory:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, spill_dir=DEFAULT_SPILL_DIR,
+                 idle_seconds=IDLE_SECONDS, ttl_seconds=TTL_SECONDS, metrics_file=METRICS_FILE):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.idle_seconds = idle_seconds
+        self.ttl_seconds = ttl_seconds
+        self.metrics_file = metrics_file
+        self._sessions = {}
+        self._lock = threading.RLock()
+        self._metrics_written = 0.0
+        self.counters = {"compressions": 0, "spills": 0, "rehydrations": 0,
+                         "cache_releases": 0, "sessions_expired": 0}
+
+    # ---------- public API ----------
+
+    def put(self, sid, name, arr):
+        with self._lock:
+            session = self._session(sid)
+            self._discard(session.entries.pop(name, None))
+            if arr is not None:
+                session.entries[name] = _Entry(arr)
+            self._enforce(protect=(sid, name))
+
+    def get(self, sid, name):
+        """The array stored under name, rehydrated if it was compressed or spilled."""
+        with self._lock:
+            session = self._session(sid)
+            entry = session.entries.get(name)
+            if entry is None:
+                return None
+            entry.last_access = time.monotonic()
+            if entry.tier != RESIDENT:
+                self._rehydrate(entry)
+                self._enforce(protect=(sid, name))
+            return entry.arr
+
+    def register_cache(self, sid, name, size, release):
+        """
+        Account a session-owned cache: size() returns its bytes, release()
+        frees it. Released caches are expected to rebuild themselves on use.
+        Registering the same name again replaces the entry, so callers can
+        register on every access.
+        """
+        with self._lock:
+            self._session(sid).caches[name] = (size, release)
+
+    def touch(self, sid):
+        """Mark the session active; call once per script run."""
+        with self._lock:
+            self._session(sid)
+            self._enforce()
+
+    def drop_session(self, sid):
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+            if session is not None:
+                for entry in session.entries.values():
+                    self._discard(entry)
+
+    # ---------- tiers ----------
+
+    def _session(self, sid):
+        session = self._sessions.get(sid)
+        if session is None:
+            session = self._sessions[sid] = _Session()
+        session.last_seen = time.monotonic()
+        return session
+
+    def _compress(self, entry):
+        entry.codec, entry.payload = compress(entry.arr)
+        entry.arr = None
+        entry.tier = COMPRESSED
+        self.counters["compressions"] += 1
+
+    def _spill(self, sid, name, entry):
+        path = os.path.join(self.spill_dir, _safe(sid), f"{_safe(name)}.{entry.codec}")
+        payload = entry.payload
+        cache_util.write_atomic(path, lambda f: f.write(payload))
+        entry.path = path
+        entry.payload = None
+        entry.tier = SPILLED
+        self.counters["spills"] += 1
+
+    def _rehydrate(self, entry):
+        payload = entry.payload
+        if entry.tier == SPILLED:
+            with open(entry.path, "rb") as f:
+                payload = f.read()
+            _remove(entry.path)
+            entry.path = None
+        entry.arr = decompress(entry.codec, payload, entry.shape, entry.dtype)
+        entry.codec = entry.payload = None
+        entry.tier = RESIDENT
+        self.counters["rehydrations"] += 1
+
+    def _discard(self, entry):
+        if entry is not None and entry.tier == SPILLED:
+            _remove(entry.path)
+
+    # ---------- budget ----------
+
+    def _ram_bytes(self):
+        return sum(
+            sum(e.nbytes() for e in s.entries.values()) + s.cache_bytes()
+            for s in self._sessions.values()
+        )
+
+    def _enforce(self, protect=None):
+        now = time.monotonic()
+        for sid in [sid for sid, s in self._sessions.items() if now - s.last_seen > self.ttl_seconds]:
+            self.drop_session(sid)
+            self.counters["sessions_expired"] += 1
+
+        # Idle sessions: release caches and compress arrays regardless of budget.
+        for session in self._sessions.values():
+            if now - session.last_seen > self.idle_seconds:
+                self._release_caches(session)
+                for entry in session.entries.values():
+                    if entry.tier == RESIDENT:
+                        self._compress(entry)
+
+        used = self._ram_bytes()
+        if used > self.budget_bytes:
+            # Least recently seen sessions give up their caches first ...
+            for session in sorted(self._sessions.values(), key=lambda s: s.last_seen):
+                if used <= self.budget_bytes:
+                    break
+                before = session.cache_bytes()
+                self._release_caches(session)
+                used -= before - session.cache_bytes()
+
+        # ... then the least recently used arrays are compressed, then spilled.
+        for tier, step in ((RESIDENT, self._compress), (COMPRESSED, None)):
+            if used <= self.budget_bytes:
+                break
+            for sid, name, entry in self._lru(tier, protect):
+                if used <= self.budget_bytes:
+                    break
+                before = entry.nbytes()
+                if step is not None:
+                    step(entry)
+                else:
+                    self._spill(sid, name, entry)
+                used -= before - entry.nbytes()
+
+        self._maybe_write_metrics()
+
+    def _lru(self, tier, protect):
+        candidates = [
+            (entry.last_access, sid, name, entry)
+            for sid, session in self._sessions.items()
+            for name, entry in session.entries.items()
+            if entry.tier == tier and (sid, name) != protect
+        ]
+        candidates.sort(key=lambda c: c[0])
+        return [(sid, name, entry) for _, sid, name, entry in candidates]
+
+    def _release_caches(self, session):
+        for size, release in session.caches.values():
+            try:
+                if size():
+                    release()
+                    self.counters["cache_releases"] += 1
+            except Exception:
+                pass
+
+    # ---------- gauges ----------
+
+    def stats(self):
+        with self._lock:
+            out = {
+                "budget_bytes": self.budget_bytes,
+                "sessions": len(self._sessions),
+                "resident_bytes": 0,
+                "compressed_bytes": 0,
+                "spilled_bytes": 0,
+                "cache_bytes": 0,
+                "raw_bytes": 0,
+                "entries": {RESIDENT: 0, COMPRESSED: 0, SPILLED: 0},
+            }
+            for session in self._sessions.values():
+                out["cache_bytes"] += session.cache_bytes()
+                for entry in session.entries.values():
+                    out["entries"][entry.tier] += 1
+                    out["raw_bytes"] += int(np.prod(entry.shape)) * entry.dtype.itemsize
+                    if entry.tier == RESIDENT:
+                        out["resident_bytes"] += entry.arr.nbytes
+                    elif entry.tier == COMPRESSED:
+                        out["compressed_bytes"] += len(entry.payload)
+                    else:
+                        out["spilled_bytes"] += _file_size(entry.path)
+            out["ram_bytes"] = out["resident_bytes"] + out["compressed_bytes"] + out["cache_bytes"]
+            out.update(self.counters)
+            return out
+
+    def prometheus_text(self):
+        s = self.stats()
+        lines = []
+
+        def metric(name, kind, value, help_text, labels=""):
+            lines.append(f"# HELP session_memory_{name} {help_text}")
+            lines.append(f"# TYPE session_memory_{name} {kind}")
+            lines.append(f"session_memory_{name}{labels} {value}")
+
+        metric("budget_bytes", "gauge", s["budget_bytes"], "Configured RAM budget for session arrays.")
+        metric("ram_bytes", "gauge", s["ram_bytes"], "RAM held by session arrays and caches.")
+        metric("resident_bytes", "gauge", s["resident_bytes"], "Uncompressed session arrays.")
+        metric("compressed_bytes", "gauge", s["compressed_bytes"], "Compressed in-memory session arrays.")
+        metric("cache_bytes", "gauge", s["cache_bytes"], "Registered per-session caches.")
+        metric("spilled_bytes", "gauge", s["spilled_bytes"], "Session arrays spilled to disk.")
+        metric("raw_bytes", "gauge", s["raw_bytes"], "Uncompressed size of all session arrays.")
+        metric("sessions", "gauge", s["sessions"], "Sessions holding state.")
+        for counter in self.counters:
+            metric(f"{counter}_total", "counter", s[counter], f"Number of {counter.replace('_', ' ')}.")
+        return "\n".join(lines) + "\n"
+
+    def _maybe_write_metrics(self):
+        now = time.monotonic()
+        if not self.metrics_file or now - self._metrics_written < METRICS_INTERVAL:
+            return
+        self._metrics_written = now
+        try:
+            text = self.prometheus_text().encode()
+            cache_util.write_atomic(self.metrics_file, lambda f: f.write(text))
+        except OSError:
+            pass
+
+
+def _safe(name):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(name))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except (FileNotFoundError, TypeError):
+        pass
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SessionMemory()
+        return _default
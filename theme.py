@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+# ===================== THEME =====================
+#
+# CSS and the background-video HTML, kept as module constants so they are
+# built once per process. group.py emits STYLE with a single st.markdown call
+# per rerun.
+
+BASE_CSS = """
+<style>
+.block-container {
+    max-width: 1200px;
+    padding: 2.5rem 2rem 1.2rem 2rem;
+}
+.stImage > img{
+    max-height:420px;
+    object-fit:contain;
+}
+section[data-testid="stExpander"]{
+    border-radius:10px;
+    padding:8px;
+    box-shadow:0 1px 6px rgba(0,0,0,0.04);
+    margin-bottom:10px;
+    background-color: var(--stLightBlue-50);
+}
+section[data-testid="stExpander"] .streamlit-expanderHeader{
+    font-size:16px;
+}
+div[data-testid="column"] button {
+    padding-top: 8px !important;
+    padding-bottom: 8px !important;
+    padding-left: 12px !important;
+    padding-right: 12px !important;
+    font-size: 14px !important;
+    width: 100%;
+    font-weight: 500 !important;
+}
+div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlockBorderWrapper"] {
+    border: 2px solid #4CAF50 !important;
+    border-radius: 12px !important;
+}
+.team-photo-container {
+    width: 140px;
+    height: 140px;
+    border-radius: 50%;
+    overflow: hidden;
+    margin: 0 auto;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    background: #f0f0f0;
+    border: 3px solid #4CAF50;
+}
+.team-photo-container img {
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+    object-position: center;
+}
+</style>
+"""
+LIGHT_CSS = """
+<style>
+.stMarkdown, .stMarkdown p, .stMarkdown li {
+    color: #ffffff !important;
+}
+button[kind="secondary"] {
+    background-color: #ffffff !important;
+    color: #000000 !important;
+    border: 2px solid #4CAF50 !important;
+    font-weight: 600 !important;
+}
+button[kind="secondary"]:hover {
+    background-color: #e8f5e9 !important;
+    color: #000000 !important;
+    border-color: #2e7d32 !important;
+}
+button[kind="primary"] {
+    background-color: #ffffff !important;
+    color: #000000 !important;
+}
+.team-photo-container {
+    background: #e8f5e9;
+    border-color: #4CAF50;
+}
+</style>
+"""
+
+STYLE = BASE_CSS + LIGHT_CSS
+
+VIDEO_BACKGROUND_TEMPLATE = """
+    <style>
+    .video-bg {{
+        position: fixed;
+        right: 0;
+        bottom: 0;
+        min-width: 100%;
+        min-height: 100%;
+        width: auto;
+        height: auto;
+        z-index: -1;
+        object-fit: cover;
+    }}
+    .stApp {{
+        background: transparent !important;
+    }}
+    </style>
+    <video class="video-bg" autoplay muted loop playsinline>
+        <source src="{video_data_url}" type="video/mp4">
+    </video>
+"""
+
+
+@lru_cache(maxsize=4)
+def video_background_html(video_data_url):
+    """Background <video> markup; formatted once per data URL."""
+    return VIDEO_BACKGROUND_TEMPLATE.format(video_data_url=video_data_url)
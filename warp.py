@@ -0,0 +1,104 @@
+import numpy as np
+import cv2
+
+import cache_util
+
+# ===================== REMAP ENGINE =====================
+#
+# Projective warps and lens undistortion both reduce to cv2.remap with a pair
+# of lookup maps. Building those maps is the expensive part, and for a fixed
+# geometry (same matrix, same output size) they never change, so they are
+# converted once to fixed-point CV_16SC2 and kept in a per-process LRU cache.
+# The module is imported once per process, so the cache survives Streamlit
+# reruns and is shared by every session.
+
+MAP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _maps_nbytes(maps):
+    return sum(m.nbytes for m in maps if m is not None)
+
+
+_map_cache = cache_util.ByteLRU(MAP_CACHE_MAX_BYTES, _maps_nbytes)
+
+
+def _matrix_key(M):
+    return np.round(np.asarray(M, dtype=np.float64), 9).tobytes()
+
+
+def clear_map_cache():
+    _map_cache.clear()
+
+
+def map_cache_info():
+    return _map_cache.info()
+
+
+def is_affine(M):
+    M = np.asarray(M)
+    if M.shape == (2, 3):
+        return True
+    return M.shape == (3, 3) and np.allclose(M[2], (0.0, 0.0, 1.0))
+
+
+# ===================== MAP BUILDERS =====================
+
+def _build_perspective_maps(M, output_size):
+    """Inverse-map every destination pixel through M and pack to CV_16SC2."""
+    w, h = output_size
+    M_inv = np.linalg.inv(np.asarray(M, dtype=np.float64))
+    xs = np.arange(w, dtype=np.float64)
+    ys = np.arange(h, dtype=np.float64)[:, None]
+
+    sw = M_inv[2, 0] * xs + M_inv[2, 1] * ys + M_inv[2, 2]
+    sw = np.where(np.abs(sw) < 1e-12, 1e-12, sw)
+    map_x = ((M_inv[0, 0] * xs + M_inv[0, 1] * ys + M_inv[0, 2]) / sw).astype(np.float32)
+    map_y = ((M_inv[1, 0] * xs + M_inv[1, 1] * ys + M_inv[1, 2]) / sw).astype(np.float32)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+def get_perspective_maps(M, output_size):
+    """Fixed-point remap tables for a 3x3 homography, cached per (M, size)."""
+    M = np.asarray(M, dtype=np.float64)
+    if M.shape != (3, 3):
+        raise ValueError(f"perspective matrix must be 3x3, got {M.shape}")
+    output_size = (int(output_size[0]), int(output_size[1]))
+    key = ("perspective", _matrix_key(M), output_size)
+    return _map_cache.get_or_build(key, lambda: _build_perspective_maps(M, output_size))
+
+
+def get_undistort_maps(camera_matrix, dist_coeffs, image_size, new_camera_matrix=None):
+    """Fixed-point undistort/rectify tables, cached per camera and size."""
+    K = np.asarray(camera_matrix, dtype=np.float64)
+    D = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+    P = K if new_camera_matrix is None else np.asarray(new_camera_matrix, dtype=np.float64)
+    image_size = (int(image_size[0]), int(image_size[1]))
+    key = ("undistort", _matrix_key(K), _matrix_key(D), _matrix_key(P), image_size)
+    return _map_cache.get_or_build(
+        key,
+        lambda: cv2.initUndistortRectifyMap(K, D, None, P, image_size, cv2.CV_16SC2),
+    )
+
+
+# ===================== WARPS =====================
+
+def remap_image(img, maps, interpolation=cv2.INTER_LINEAR, border_mode=cv2.BORDER_REFLECT):
+    map1, map2 = maps
+    return cv2.remap(img, map1, map2, interpolation, borderMode=border_mode)
+
+
+def warp_perspective(img, M, output_size=None,
+                     interpolation=cv2.INTER_LINEAR, border_mode=cv2.BORDER_REFLECT):
+    """Apply a full 3x3 projective transform; channel order is preserved."""
+    h, w = img.shape[:2]
+    if output_size is None:
+        output_size = (w, h)
+    maps = get_perspective_maps(M, output_size)
+    return remap_image(img, maps, interpolation, border_mode)
+
+
+def undistort(img, camera_matrix, dist_coeffs, new_camera_matrix=None,
+              interpolation=cv2.INTER_LINEAR, border_mode=cv2.BORDER_CONSTANT):
+    h, w = img.shape[:2]
+    maps = get_undistort_maps(camera_matrix, dist_coeffs, (w, h), new_camera_matrix)
+    return remap_image(img, maps, interpolation, border_mode)